@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FIXTURES_DIR = PROJECT_ROOT / 'fixtures'
+DEFAULT_RESULTS_FILE = PROJECT_ROOT / 'logs' / 'benchmarks.jsonl'
+
+# 이전 커밋 대비 이 비율(%) 이상 느려지면 회귀로 표시
+DEFAULT_REGRESSION_THRESHOLD = 10.0
+
+# 벤치마크는 외부 서비스에 접속하지 않으므로 인증 정보가 없어도 객체를 만들 수 있게 함
+for _name in ('DEEPSEEK_API_KEY', 'NAVER_USERNAME', 'NAVER_PASSWORD'):
+    os.environ.setdefault(_name, 'benchmark')
+
+from blog_poster import NaverBlogPoster  # noqa: E402
+from data_collector import ExchangeRateCollector  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from market_analyzer import ExchangeRateAnalyzer  # noqa: E402
+from tracing import get_ledger  # noqa: E402
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding='utf-8')
+
+
+def benchmark_config() -> dict:
+    """외부 응답 캐시와 원장 기록 없이 실행하는 벤치마크용 설정입니다."""
+    return {
+        'deepseek': {'cache': {'enabled': False}},
+        'tracing': {'enabled': False},
+    }
+
+
+def create_tags_uncached(analyzer: ExchangeRateAnalyzer, title: str, content: str):
+    """태그 결과는 내용 해시로 캐시되므로 매 반복마다 캐시를 비워 실제 순위 계산을 측정합니다."""
+    analyzer.tag_engine.ranker.clear_cache()
+    return analyzer._create_tags_from_content(title, content)
+
+
+def build_benchmarks(config: dict) -> Dict[str, Callable]:
+    """로컬 픽스처만 사용하는 벤치마크 대상 함수를 이름별로 만듭니다."""
+    collector = ExchangeRateCollector(config)
+    analyzer = ExchangeRateAnalyzer(config)
+    poster = NaverBlogPoster(config)
+
+    naver_html = read_fixture('naver_exchange.html')
+    yahoo_html = read_fixture('yahoo_news.html')
+    commentary = read_fixture('commentary.txt')
+    # 긴 논평에서의 태그 추출 성능을 보기 위해 본문을 네 배로 늘림
+    long_commentary = '\n\n'.join([commentary] * 4)
+    title = commentary.split('\n', 1)[0]
+
+    news = collector._parse_naver_news(naver_html)
+    prompt_data = {
+        'current_rate': 1384.5,
+        'daily_change': 0.30,
+        'change_value': 4.2,
+        'date': datetime.now(),
+        'naver_news': news
+    }
+
+    return {
+        'collector.parse_naver_news': lambda: collector._parse_naver_news(naver_html),
+        'collector.parse_yahoo_news': lambda: collector._parse_yahoo_news(yahoo_html),
+        'analyzer.create_tags_from_content': lambda: create_tags_uncached(analyzer, title, long_commentary),
+        'analyzer.extract_tag_terms': lambda: analyzer.tag_engine.extract_terms(title, long_commentary),
+        'analyzer.commentary_prompt': lambda: analyzer._create_market_commentary_prompt(prompt_data),
+        'analyzer.title_prompt': lambda: analyzer._create_title_from_commentary_prompt(commentary),
+        'analyzer.single_pass_prompt': lambda: analyzer._create_single_pass_prompt(prompt_data),
+        'analyzer.format_blog_content': lambda: analyzer.format_blog_content(commentary),
+        'poster.format_blog_content': lambda: poster.format_blog_content(commentary),
+        'poster.generate_market_tags': lambda: poster.generate_market_tags(title, long_commentary),
+    }
+
+
+def build_browser_benchmark(config: dict, server: FixtureServer) -> Optional[NaverBlogPoster]:
+    """픽스처 편집기 화면에 로그인된 브라우저를 준비합니다. 실패하면 None을 반환합니다."""
+    config = dict(config)
+    config['blog'] = {
+        'url': f"{server.base_url}/blog",
+        'login_url': f"{server.base_url}/nidlogin.login",
+        'write_url': f"{server.base_url}/postwrite",
+        'cookie_origin': f"{server.base_url}/robots.txt",
+    }
+    config['browser'] = {'headless': True, 'block_resources': False, 'user_data_dir': ''}
+    poster = NaverBlogPoster(config)
+    poster.cookies_file = PROJECT_ROOT / 'logs' / 'benchmark_cookies.pkl'
+    if not poster.setup_driver() or not poster.login():
+        poster.close()
+        return None
+    return poster
+
+
+def measure(func: Callable, repeat: int, number: int = None) -> Dict[str, float]:
+    """함수를 여러 번 실행하여 호출당 소요 시간(ms)의 최소/중앙/평균값을 반환합니다."""
+    timer = timeit.Timer(func)
+    if number is None:
+        # 한 번의 측정이 0.2초 이상 걸리도록 반복 횟수를 자동으로 정함
+        number, _ = timer.autorange()
+    runs = [elapsed / number * 1000 for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min_ms': round(min(runs), 4),
+        'median_ms': round(statistics.median(runs), 4),
+        'mean_ms': round(statistics.mean(runs), 4),
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def git_revision() -> str:
+    """현재 커밋 해시를 반환합니다. 커밋되지 않은 변경이 있으면 '-dirty'를 붙입니다."""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def load_baseline(results_file: Path, revision: str) -> Optional[Dict]:
+    """현재와 다른 커밋에서 가장 최근에 저장한 결과를 반환합니다."""
+    if not results_file.exists():
+        return None
+    baseline = None
+    with open(results_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('revision') != revision:
+                baseline = record
+    return baseline
+
+
+def print_report(results: Dict[str, Dict], baseline: Optional[Dict], threshold: float) -> int:
+    """결과를 기준 커밋과 비교해 출력하고, 회귀로 판단된 항목 수를 반환합니다."""
+    previous = (baseline or {}).get('results', {})
+    if baseline:
+        print(f"기준: {baseline['revision']} ({baseline['time']})")
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'median(ms)':>11}  {'min(ms)':>9}  {'change':>8}")
+
+    regressions = 0
+    for name, result in results.items():
+        change = ''
+        before = previous.get(name, {}).get('median_ms')
+        if before:
+            delta = (result['median_ms'] - before) / before * 100
+            change = f"{delta:+.1f}%"
+            if delta > threshold:
+                change += ' ▲'
+                regressions += 1
+        print(f"{name:<{width}}  {result['median_ms']:>11.4f}  {result['min_ms']:>9.4f}  {change:>8}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집기/분석기/포스터 주요 경로 벤치마크 (로컬 픽스처 사용)")
+    parser.add_argument('--repeat', type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument('--filter', default='', help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument('--browser', action='store_true', help="픽스처 편집기에 대한 create_post 전체 흐름도 측정 (Chrome 필요)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="회귀로 표시할 중앙값 증가율 (%%)")
+    parser.add_argument('--output', default=str(DEFAULT_RESULTS_FILE), help="결과를 누적 저장할 JSONL 파일")
+    parser.add_argument('--no-save', action='store_true', help="결과를 저장하지 않음")
+    args = parser.parse_args()
+
+    config = benchmark_config()
+    get_ledger(config)  # 측정 중 실행 원장을 기록하지 않도록 먼저 초기화
+    results = {}
+    for name, func in build_benchmarks(config).items():
+        if args.filter in name:
+            results[name] = measure(func, args.repeat)
+
+    if args.browser and args.filter in 'poster.create_post':
+        server = FixtureServer().start()
+        poster = None
+        try:
+            poster = build_browser_benchmark(config, server)
+            if poster is None:
+                print("✗ 픽스처 편집기용 브라우저 준비 실패 - create_post 측정을 건너뜁니다.")
+            else:
+                commentary = read_fixture('commentary.txt')
+                tags = poster.generate_market_tags('환율', commentary)
+                results['poster.create_post'] = measure(
+                    lambda: poster.create_post('벤치마크 제목', commentary, tags), args.repeat, number=1
+                )
+        finally:
+            if poster is not None:
+                poster.close()
+            server.stop()
+
+    if not results:
+        print("실행할 벤치마크가 없습니다.")
+        return
+
+    output = Path(args.output)
+    revision = git_revision()
+    regressions = print_report(results, load_baseline(output, revision), args.threshold)
+
+    if not args.no_save:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'revision': revision,
+                'results': results
+            }, ensure_ascii=False) + '\n')
+        print(f"\n결과 저장: {output}")
+
+    if regressions:
+        print(f"✗ 기준 대비 {args.threshold:.0f}% 이상 느려진 항목: {regressions}개")
+
+
+if __name__ == "__main__":
+    # 사용 예: python benchmark.py --repeat 7 --filter analyzer
+    main()
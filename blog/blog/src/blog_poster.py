@@ -7,13 +7,75 @@ import logging
 import os
 import time
 import pickle
+import platform
+import re
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from datetime import datetime
 from selenium.webdriver.common.action_chains import ActionChains
+from tracing import trace_stage, traced
+from tag_engine import get_tag_engine
+
+# 리소스 차단 시 기본으로 막는 요청 (이미지, 미디어, 폰트, 분석/광고 스크립트)
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.mp3',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*wcs.naver.net*', '*nlog.naver.com*', '*siape.veta.naver.com*'
+]
+
+# 로그인 쿠키 저장 경로
+COOKIES_FILE = Path(__file__).parent.parent / 'config' / 'naver_cookies.pkl'
+
+# 쿠키를 복원하기 위해 먼저 열어 두는 naver.com 도메인의 가벼운 문서
+NAVER_COOKIE_ORIGIN = 'https://www.naver.com/robots.txt'
+
+# 네이버 로그인 페이지 (재생 실행 시 blog.login_url로 로컬 픽스처 서버를 사용)
+NAVER_LOGIN_URL = 'https://nid.naver.com/nidlogin.login'
+DEFAULT_BLOG_URL = 'https://blog.naver.com/gongnyangi'
+
+# 블로그 상단 메뉴의 로그인 상태 표시 (로그인 상태: 로그아웃 링크/내 정보 영역, 로그아웃 상태: 로그인 버튼)
+LOGGED_IN_SELECTOR = 'a[href*="nidlogin.logout"], .gnb_my'
+LOGGED_OUT_SELECTOR = '.log_btn'
+
+# SmartEditor 제목 영역 선택자
+TITLE_PLACEHOLDER_SELECTOR = 'span.se-placeholder.__se_placeholder.se-ff-nanumgothic.se-fs32'
+TITLE_NODE_SELECTOR = 'span.se-ff-nanumgothic.se-fs32.__se-node'
+TITLE_TEXT_SELECTOR = '.se-documentTitle'
+# 입력 확인 시 읽어올 편집기 본문 영역 (제목 포함)
+EDITOR_CONTENT_SELECTOR = '.se-content'
+# 입력 확인에 사용할 앞/뒤 글자 수
+VERIFY_CHARS = 30
+
+# 발행 설정 창의 태그 입력창
+TAG_INPUT_SELECTOR = 'input#tag-input.tag_input__rvUB5'
+
+# 편집기 단계 대기 시 상태 확인 간격 (초)
+WAIT_POLL_INTERVAL = 0.1
+
+
+def editable_element_focused(driver):
+    """입력 가능한 요소(contenteditable, input, textarea)에 포커스가 있는지 확인합니다."""
+    return driver.execute_script("""
+        var el = document.activeElement;
+        return !!el && (el.isContentEditable || el.tagName === 'TEXTAREA' || el.tagName === 'INPUT' || el.tagName === 'IFRAME');
+    """)
+
+
+def text_rendered(selector: str, text: str):
+    """선택자 영역에 주어진 텍스트가 그려졌는지 확인하는 대기 조건을 만듭니다."""
+    expected = text.strip()[:20]
+
+    def _condition(driver):
+        rendered = driver.execute_script(
+            "var el = document.querySelector(arguments[0]); return el ? el.innerText : null;", selector)
+        # 영역을 찾지 못하면 확인할 수 없으므로 통과
+        return rendered is None or expected in rendered
+    return _condition
 
 class NaverBlogPoster:
     def __init__(self, config: dict):
@@ -22,29 +84,67 @@ class NaverBlogPoster:
         self.username = os.getenv('NAVER_USERNAME')
         self.password = os.getenv('NAVER_PASSWORD')
         self.driver = None
-        self.cookies_file = Path(__file__).parent.parent / 'config' / 'naver_cookies.pkl'
+        self.step_timings = {}  # 마지막 포스팅의 단계별 소요 시간 (초)
+        self.cookies_file = Path(config.get('browser', {}).get('cookies_file') or COOKIES_FILE)
+        # 로그인/글쓰기 페이지 주소 (녹화 재생 시 로컬 픽스처 서버로 바꿀 수 있음)
+        blog_config = config.get('blog', {})
+        self.blog_url = blog_config.get('url', DEFAULT_BLOG_URL).rstrip('/')
+        self.login_url = blog_config.get('login_url', NAVER_LOGIN_URL)
+        self.write_url = blog_config.get('write_url', f"{self.blog_url}/postwrite")
+        self.cookie_origin = blog_config.get('cookie_origin', NAVER_COOKIE_ORIGIN)
         
         if not self.username or not self.password:
             self.logger.error("Naver credentials not found in environment variables")
             raise ValueError("네이버 로그인 정보가 환경변수에 설정되지 않았습니다.")
 
+    @traced('browser.setup_driver')
     def setup_driver(self):
         """Selenium WebDriver를 초기화합니다."""
         try:
+            settings = self.config.get('browser', {})
             options = webdriver.ChromeOptions()
             options.add_argument('--no-sandbox')
-            options.add_argument('--start-maximized')
             options.add_argument('--disable-dev-shm-usage')
             options.add_argument('--disable-blink-features=AutomationControlled')
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
             
+            if settings.get('headless', False):
+                # 화면 없이 실행 (new headless는 일반 Chrome과 같은 렌더링 엔진 사용)
+                options.add_argument('--headless=new')
+                options.add_argument('--window-size=1920,1080')
+            else:
+                options.add_argument('--start-maximized')
+            
+            # DOMContentLoaded 시점에 제어를 돌려받고, 이후 준비 상태는 단계별 대기로 확인
+            options.page_load_strategy = settings.get('page_load_strategy', 'normal')
+            
+            # 전용 프로필 디렉터리 (로그인 상태와 캐시 유지)
+            user_data_dir = settings.get('user_data_dir')
+            if user_data_dir:
+                profile_path = Path(user_data_dir)
+                if not profile_path.is_absolute():
+                    profile_path = Path(__file__).parent.parent / profile_path
+                profile_path.mkdir(parents=True, exist_ok=True)
+                options.add_argument(f'--user-data-dir={profile_path}')
+            
+            block_resources = settings.get('block_resources', False)
+            if block_resources:
+                # 포스팅에 필요 없는 기능과 이미지 로딩 비활성화
+                options.add_argument('--disable-extensions')
+                options.add_argument('--disable-background-networking')
+                options.add_argument('--disable-features=Translate,MediaRouter,OptimizationHints')
+                options.add_argument('--mute-audio')
+                options.add_experimental_option('prefs', {
+                    'profile.managed_default_content_settings.images': 2
+                })
+            
             # User-Agent 설정
             options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36')
             
-            # ChromeDriver 경로 직접 지정
-            chromedriver_path = Path(__file__).parent / 'chromedriver' / 'chromedriver-win64' / 'chromedriver.exe'
-            service = Service(executable_path=str(chromedriver_path))
+            # 운영체제에 맞는 ChromeDriver 사용
+            chromedriver_path = self._resolve_driver_path(settings)
+            service = Service(executable_path=chromedriver_path) if chromedriver_path else Service()
             self.driver = webdriver.Chrome(service=service, options=options)
             self.driver.set_page_load_timeout(30)
             
@@ -57,17 +157,46 @@ class NaverBlogPoster:
                 '''
             })
             
+            if block_resources:
+                # 이미지, 미디어, 폰트, 분석 스크립트 요청 차단
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {
+                    'urls': settings.get('blocked_url_patterns', DEFAULT_BLOCKED_URL_PATTERNS)
+                })
+            
             return True
         except Exception as e:
             self.logger.error(f"Failed to setup WebDriver: {e}", exc_info=True)
             print(f"✗ 웹드라이버 설정 실패: {str(e)}")
             return False
 
+    def _resolve_driver_path(self, settings: dict) -> Optional[str]:
+        """실행 환경에 맞는 ChromeDriver 경로를 찾습니다.
+
+        설정 파일의 경로, Windows용 내장 드라이버, webdriver-manager 순서로 확인하며
+        모두 실패하면 None을 반환하여 Selenium Manager가 찾도록 합니다.
+        """
+        configured = settings.get('driver_path')
+        if configured and Path(configured).exists():
+            return str(configured)
+        
+        if platform.system() == 'Windows':
+            bundled = Path(__file__).parent / 'chromedriver' / 'chromedriver-win64' / 'chromedriver.exe'
+            if bundled.exists():
+                return str(bundled)
+        
+        try:
+            return ChromeDriverManager().install()
+        except Exception as e:
+            self.logger.warning(f"webdriver-manager로 ChromeDriver를 찾지 못했습니다: {e}")
+            return None
+
+    @traced('browser.login')
     def login(self):
         """네이버에 로그인합니다."""
         try:
             # 네이버 로그인 페이지로 이동
-            self.driver.get('https://nid.naver.com/nidlogin.login')
+            self.driver.get(self.login_url)
             time.sleep(2)
             
             # JavaScript를 통한 로그인 정보 입력
@@ -88,9 +217,10 @@ class NaverBlogPoster:
             # 로그인 성공 확인
             try:
                 WebDriverWait(self.driver, 5).until(
-                    lambda d: 'nid.naver.com/nidlogin.login' not in d.current_url
+                    lambda d: self.login_url not in d.current_url
                 )
                 print("✓ 네이버 로그인 성공")
+                self.save_cookies()
                 return True
             except TimeoutException:
                 print("✗ 로그인 실패: 아이디 또는 비밀번호를 확인해주세요.")
@@ -104,69 +234,73 @@ class NaverBlogPoster:
     def check_login_status(self):
         """현재 로그인 상태를 확인합니다."""
         try:
-            self.driver.get('https://blog.naver.com/gongnyangi')
-            time.sleep(2)
-            
-            # 로그인 버튼이 있는지 확인
-            login_buttons = self.driver.find_elements(By.CLASS_NAME, 'log_btn')
-            return len(login_buttons) == 0
+            self.driver.get(self.blog_url)
+            # eager 로딩에서는 문서 준비 직후 상단 메뉴가 아직 그려지지 않았을 수 있으므로
+            # 로그인/로그아웃 상태 표시 중 하나가 나타날 때까지 기다림
+            state = WebDriverWait(self.driver, 10, poll_frequency=WAIT_POLL_INTERVAL).until(
+                lambda d: ('in' if d.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR)
+                           else 'out' if d.find_elements(By.CSS_SELECTOR, LOGGED_OUT_SELECTOR)
+                           else False)
+            )
+            return state == 'in'
             
+        except TimeoutException:
+            self.logger.info("로그인 상태 표시를 찾지 못해 로그아웃 상태로 간주합니다.")
+            return False
         except Exception:
             return False
 
-    def generate_market_tags(self, title: str, content: str) -> List[str]:
-        """글의 내용에 따라 적절한 태그를 생성합니다."""
-        # 기본 태그 (항상 포함)
-        base_tags = [
-            "주식시장", "증권", "주식투자", "미국주식", "글로벌경제",
-            "시장분석", "투자정보", "주식정보", "시장동향", "금융시장"
-        ]
-        
-        # 시장 상황별 태그
-        market_condition_tags = {
-            "상승": ["주식상승", "매수전략", "상승장", "강세장", "매수기회"],
-            "하락": ["주식하락", "매도전략", "하락장", "약세장", "리스크관리"],
-            "변동성": ["변동성장세", "리스크관리", "투자전략", "자산관리", "포트폴리오"]
-        }
-        
-        # 자산군 태그
-        asset_tags = {
-            "주식": ["개별주식", "성장주", "가치주", "배당주", "기술주"],
-            "원자재": ["원자재", "금", "은", "원유", "commodities"],
-            "채권": ["채권", "국채", "회사채", "금리", "채권투자"],
-            "환율": ["환율", "달러", "외환시장", "달러인덱스", "외환"]
-        }
-        
-        # 글의 내용에서 키워드 분석
-        content_lower = content.lower()
-        selected_tags = set(base_tags)  # 중복 방지를 위해 set 사용
-        
-        # 시장 상황 태그 추가
-        if any(word in content_lower for word in ["상승", "급등", "강세", "매수"]):
-            selected_tags.update(market_condition_tags["상승"])
-        if any(word in content_lower for word in ["하락", "급락", "약세", "매도"]):
-            selected_tags.update(market_condition_tags["하락"])
-        if any(word in content_lower for word in ["변동성", "불확실성", "리스크"]):
-            selected_tags.update(market_condition_tags["변동성"])
-        
-        # 자산군 태그 추가
-        for asset_type, tags in asset_tags.items():
-            if asset_type.lower() in content_lower:
-                selected_tags.update(tags)
-        
-        # 현재 날짜 태그 추가
-        today = datetime.now()
-        date_tags = [
-            today.strftime("%Y년%m월"),
-            today.strftime("%Y년%m월%d일"),
-            "데일리브리핑",
-            "시장브리핑"
-        ]
-        selected_tags.update(date_tags)
+    def save_cookies(self):
+        """로그인된 세션의 쿠키를 파일에 저장합니다."""
+        try:
+            self.cookies_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cookies_file, 'wb') as f:
+                pickle.dump(self.driver.get_cookies(), f)
+            self.logger.info(f"로그인 쿠키 저장 완료: {self.cookies_file}")
+        except Exception as e:
+            self.logger.warning(f"쿠키 저장 실패: {e}")
+
+    def restore_session(self) -> bool:
+        """저장된 쿠키로 로그인 세션을 복원하고 유효한지 확인합니다."""
+        if not self.cookies_file.exists():
+            return False
         
-        # 태그 리스트로 변환 및 최대 30개로 제한
-        final_tags = list(selected_tags)[:30]
-        return final_tags
+        try:
+            with open(self.cookies_file, 'rb') as f:
+                cookies = pickle.load(f)
+            
+            # 쿠키는 같은 도메인의 문서에서만 추가할 수 있으므로 가벼운 페이지로 먼저 이동
+            self.driver.get(self.cookie_origin)
+            restored = 0
+            for cookie in cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                    restored += 1
+                except WebDriverException:
+                    # 다른 하위 도메인 전용 쿠키는 건너뜀
+                    continue
+            
+            if restored and self.check_login_status():
+                print("✓ 저장된 쿠키로 로그인 세션 복원")
+                return True
+            
+            self.logger.info("저장된 쿠키가 만료되어 다시 로그인합니다.")
+            self.driver.delete_all_cookies()
+            return False
+            
+        except Exception as e:
+            self.logger.warning(f"쿠키 세션 복원 실패: {e}")
+            return False
+
+    def ensure_login(self) -> bool:
+        """저장된 쿠키로 세션 복원을 먼저 시도하고, 실패하면 아이디/비밀번호로 로그인합니다."""
+        if self.restore_session():
+            return True
+        return self.login()
+
+    def generate_market_tags(self, title: str, content: str) -> List[str]:
+        """글의 내용에 따라 적절한 태그를 생성합니다 (최대 blog_settings.tags_limit개)."""
+        return get_tag_engine(self.config).market_tags(title, content)
 
     def format_blog_content(self, content: str) -> str:
         """블로그 포스팅용으로 콘텐츠를 포맷팅합니다."""
@@ -221,29 +355,191 @@ class NaverBlogPoster:
             self.logger.error(f"Content formatting error: {e}")
             return content  # 에러 발생 시 원본 콘텐츠 반환
 
+    def _wait_step(self, step: str, condition, timeout: float = 10, required: bool = True):
+        """편집기 단계가 준비될 때까지 기다리고 실제로 걸린 시간을 기록합니다.
+
+        required가 False면 시간 초과 시 예외 대신 None을 반환합니다.
+        """
+        started = time.monotonic()
+        with trace_stage(f'post.{step}') as span:
+            try:
+                result = WebDriverWait(self.driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+                elapsed = time.monotonic() - started
+                self.step_timings[step] = elapsed
+                self.logger.info(f"[{step}] {elapsed:.2f}초")
+                return result
+            except TimeoutException:
+                self.step_timings[step] = time.monotonic() - started
+                if not required:
+                    # 선택 단계는 나타나지 않아도 실패가 아니므로 상태는 ok로 두고 건너뜀만 표시
+                    span.attrs['skipped'] = True
+                    self.logger.info(f"[{step}] {timeout}초 내에 나타나지 않음 - 건너뜀")
+                    return None
+                span.status = 'timeout'
+                self.logger.error(f"[{step}] {timeout}초 내에 준비되지 않음")
+                raise
+
+    def _paste_text(self, text: str):
+        """포커스된 편집 영역에 붙여넣기 이벤트로 텍스트를 한 번에 전달합니다.
+
+        SmartEditor는 붙여넣기 데이터를 문단 단위로 변환하므로 줄바꿈이 그대로 유지됩니다.
+        """
+        self.driver.execute_script("""
+            var target = document.activeElement || document.body;
+            var data = new DataTransfer();
+            data.setData('text/plain', arguments[0]);
+            target.dispatchEvent(new ClipboardEvent('paste', {
+                clipboardData: data, bubbles: true, cancelable: true
+            }));
+        """, text)
+
+    def _cdp_insert_text(self, text: str):
+        """Chrome DevTools의 Input.insertText로 IME 확정 입력처럼 텍스트를 한 번에 입력합니다."""
+        self.driver.execute_cdp_cmd('Input.insertText', {'text': text})
+
+    def _editor_text(self) -> str:
+        """편집기에 현재 그려진 텍스트를 공백을 제거한 형태로 읽어옵니다."""
+        rendered = self.driver.execute_script(
+            "var el = document.querySelector(arguments[0]) || document.body; return el.innerText;",
+            EDITOR_CONTENT_SELECTOR
+        )
+        return re.sub(r'\s+', '', rendered or '')
+
+    def _insert_text(self, text: str, step: str) -> bool:
+        """텍스트를 한 번의 동작으로 입력하고 편집기에서 다시 읽어 확인합니다.
+
+        붙여넣기 이벤트를 먼저 시도하고, 반영되지 않으면 Input.insertText를 사용합니다.
+        모두 실패하면 False를 반환하여 호출자가 키 입력 방식으로 대체할 수 있게 합니다.
+        확인 시간이 지난 뒤 늦게 반영된 입력이 있으면 다음 방식으로 다시 입력하지 않습니다 (내용 중복 방지).
+        """
+        expected = re.sub(r'\s+', '', text)
+        head, tail = expected[:VERIFY_CHARS], expected[-VERIFY_CHARS:]
+        
+        def rendered_late() -> bool:
+            current = self._editor_text()
+            if head in current or tail in current:
+                self.logger.info(f"{step} 입력이 확인 시간 이후에 반영되어 다시 입력하지 않습니다.")
+                return True
+            return False
+        
+        for index, (method, insert) in enumerate((('paste', self._paste_text), ('insert_text', self._cdp_insert_text))):
+            if index and rendered_late():
+                return True
+            try:
+                insert(text)
+            except WebDriverException as e:
+                self.logger.warning(f"{step} {method} 입력 실패: {e}")
+                continue
+            
+            inserted = self._wait_step(f'{step}_{method}', lambda d: head in self._editor_text(),
+                                       timeout=3, required=False)
+            if inserted:
+                if tail not in self._editor_text():
+                    # 일부만 반영된 경우 다시 입력하면 내용이 중복되므로 그대로 진행
+                    self.logger.warning(f"{step} 입력 확인: 끝부분이 편집기에 보이지 않습니다.")
+                return True
+        
+        # 호출자가 키 입력으로 대체하기 전에 마지막으로 다시 확인
+        return rendered_late()
+
+    def _rendered_tags(self, tags: List[str]) -> List[str]:
+        """발행 설정 창에 태그 칩으로 표시된 태그만 골라 반환합니다.
+
+        태그 영역 안의 텍스트 노드를 칩 하나당 하나씩 모아 정확히 같은 태그만 인정합니다
+        (짧은 태그가 다른 칩의 일부로 포함되어 등록된 것으로 잘못 판단되지 않도록).
+        """
+        chip_texts = self.driver.execute_script("""
+            var input = document.querySelector(arguments[0]);
+            if (!input) return [];
+            var area = input.closest('[class*="tag_area"], [class*="tag_wrap"]') || input.parentElement.parentElement;
+            if (!area) return [];
+            var texts = [];
+            var walker = document.createTreeWalker(area, NodeFilter.SHOW_TEXT);
+            while (walker.nextNode()) {
+                var text = walker.currentNode.nodeValue.trim();
+                if (text) texts.push(text);
+            }
+            return texts;
+        """, TAG_INPUT_SELECTOR) or []
+        rendered = {text.lstrip('#').strip() for text in chip_texts}
+        return [tag for tag in tags if tag in rendered]
+
+    def _enter_tags(self, tags: List[str]) -> List[str]:
+        """태그 입력창을 한 번만 찾아 모든 태그를 입력하고, 실제로 등록된 태그 목록을 반환합니다.
+
+        스크립트 한 번으로 전체 태그를 입력한 뒤, 칩으로 표시되지 않은 태그만
+        같은 입력창에 연속으로 다시 입력합니다.
+        """
+        tag_input = self._wait_step('tag_input_ready', EC.presence_of_element_located(
+            (By.CSS_SELECTOR, TAG_INPUT_SELECTOR)
+        ), timeout=10)
+        
+        # React 입력창이므로 네이티브 setter로 값을 넣고 input/Enter 이벤트를 발생시킴
+        self.driver.execute_script("""
+            var input = arguments[0];
+            var setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+            arguments[1].forEach(function(tag) {
+                input.focus();
+                setValue.call(input, tag);
+                input.dispatchEvent(new Event('input', {bubbles: true}));
+                ['keydown', 'keypress', 'keyup'].forEach(function(type) {
+                    input.dispatchEvent(new KeyboardEvent(type, {
+                        key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true, cancelable: true
+                    }));
+                });
+            });
+        """, tag_input, tags)
+        self._wait_step('tags_rendered', lambda d: len(self._rendered_tags(tags)) == len(tags),
+                        timeout=2, required=False)
+        
+        # 스크립트로 등록되지 않은 태그는 같은 입력창에 키 입력으로 연속 입력
+        missing = [tag for tag in tags if tag not in self._rendered_tags(tags)]
+        if missing:
+            self.logger.info(f"스크립트로 등록되지 않은 태그 {len(missing)}개를 키 입력으로 재시도")
+            for tag in missing:
+                tag_input.clear()
+                tag_input.send_keys(tag)
+                tag_input.send_keys(Keys.ENTER)
+                # 태그가 등록되면 입력창이 비워짐
+                self._wait_step('tag_committed', lambda d: tag_input.get_attribute('value') == '',
+                                timeout=3, required=False)
+        
+        entered = self._rendered_tags(tags)
+        if len(entered) < len(tags):
+            self.logger.warning(f"등록되지 않은 태그: {', '.join(t for t in tags if t not in entered)}")
+        return entered
+
+    @traced('post.create')
     def create_post(self, title: str, content: str, tags: List[str] = None) -> bool:
         """블로그 포스트를 작성합니다."""
+        self.step_timings = {}
+        post_started = time.monotonic()
         try:
             # 글쓰기 페이지로 이동
-            self.driver.get("https://blog.naver.com/gongnyangi/postwrite")
-            time.sleep(5)
+            self.driver.get(self.write_url)
             
             print(f"현재 URL: {self.driver.current_url}")
             
-            # 페이지 및 팝업 로드를 위한 충분한 대기 시간
-            time.sleep(3)
+            # 편집기 또는 이전 글 작성 확인 팝업이 나타날 때까지 대기
+            self._wait_step('editor_loaded', EC.any_of(
+                EC.visibility_of_element_located((By.CLASS_NAME, 'se-popup-button-text')),
+                EC.presence_of_element_located((By.CSS_SELECTOR, TITLE_PLACEHOLDER_SELECTOR)),
+                EC.presence_of_element_located((By.CSS_SELECTOR, TITLE_NODE_SELECTOR))
+            ), timeout=20)
             
             # 이전 글 작성 확인 팝업이 있는지 확인하고 처리 (최우선)
             try:
-                # 팝업 확인 (명시적 대기 없이 빠르게 확인)
-                cancel_buttons = self.driver.find_elements(By.CLASS_NAME, 'se-popup-button-text')
+                # 편집기보다 팝업이 늦게 그려지는 경우를 위해 짧게 확인
+                cancel_buttons = self._wait_step('popup_shown', lambda d: [
+                    button for button in d.find_elements(By.CLASS_NAME, 'se-popup-button-text')
+                    if button.is_displayed() and button.text == '취소'
+                ], timeout=1, required=False)
                 if cancel_buttons:
-                    for button in cancel_buttons:
-                        if button.text == '취소':
-                            button.click()
-                            time.sleep(2)
-                            print("- 이전 글 취소 처리 완료")
-                            break
+                    cancel_buttons[0].click()
+                    self._wait_step('popup_dismissed', lambda d: not any(
+                        button.is_displayed() for button in d.find_elements(By.CLASS_NAME, 'se-popup-button-text')
+                    ), timeout=5, required=False)
+                    print("- 이전 글 취소 처리 완료")
             except Exception as e:
                 print("이전 글 팝업 없음 - 계속 진행")
             
@@ -254,7 +550,7 @@ class NaverBlogPoster:
                     try:
                         if button.get_attribute('class') and '닫기' in button.get_attribute('class'):
                             button.click()
-                            time.sleep(1)
+                            self._wait_step('help_closed', EC.invisibility_of_element(button), timeout=3, required=False)
                             print("- 도움말 닫기 완료")
                             break
                     except:
@@ -268,7 +564,7 @@ class NaverBlogPoster:
                 title_area = None
                 try:
                     title_area = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'span.se-placeholder.__se_placeholder.se-ff-nanumgothic.se-fs32'))
+                        EC.presence_of_element_located((By.CSS_SELECTOR, TITLE_PLACEHOLDER_SELECTOR))
                     )
                 except:
                     print("제목 영역을 placeholder로 찾지 못함 - 다른 방법 시도")
@@ -276,7 +572,7 @@ class NaverBlogPoster:
                 # 제목 영역 찾기 시도 2: 직접 클래스로 찾기
                 if not title_area:
                     try:
-                        title_area = self.driver.find_element(By.CSS_SELECTOR, 'span.se-ff-nanumgothic.se-fs32.__se-node')
+                        title_area = self.driver.find_element(By.CSS_SELECTOR, TITLE_NODE_SELECTOR)
                     except:
                         print("제목 영역을 클래스로 찾지 못함")
                 
@@ -284,19 +580,19 @@ class NaverBlogPoster:
                     print("제목 영역을 찾을 수 없습니다")
                     return False
                 
-                # 제목 영역 클릭 및 입력
+                # 제목 영역 클릭 후 입력 커서가 잡힐 때까지 대기
                 title_area.click()
-                time.sleep(1)
+                self._wait_step('title_focused', editable_element_focused, timeout=3, required=False)
                 
-                # 제목 입력
-                actions = ActionChains(self.driver)
-                actions.send_keys(title).perform()
+                # 제목 입력 (한 번에 입력, 실패 시 키 입력으로 대체)
+                if not self._insert_text(title, 'title'):
+                    ActionChains(self.driver).send_keys(title).perform()
+                    self._wait_step('title_rendered', text_rendered(TITLE_TEXT_SELECTOR, title), timeout=5, required=False)
                 print("- 제목 입력 완료")
-                time.sleep(1)
                 
                 # Enter 키를 눌러 본문 영역으로 이동
-                actions.send_keys(Keys.ENTER).perform()
-                time.sleep(1)
+                ActionChains(self.driver).send_keys(Keys.ENTER).perform()
+                self._wait_step('body_focused', editable_element_focused, timeout=3, required=False)
                 
             except Exception as e:
                 print(f"제목 입력 실패: {e}")
@@ -304,20 +600,22 @@ class NaverBlogPoster:
             
             # 본문 입력
             try:
-                # 본문 입력 (Tab으로 이동했으므로 바로 입력 가능)
-                actions = ActionChains(self.driver)
-                # 본문을 그대로 입력
-                actions.send_keys(content.strip())  # 앞뒤 공백만 제거하고 그대로 입력
-                actions.perform()
+                # 본문 입력 (Enter로 이동했으므로 바로 입력 가능)
+                # 앞뒤 공백만 제거하고 그대로 한 번에 입력, 실패 시 키 입력으로 대체
+                if not self._insert_text(content.strip(), 'body'):
+                    actions = ActionChains(self.driver)
+                    actions.send_keys(content.strip())
+                    actions.perform()
                 print("- 본문 입력 완료")
-                time.sleep(2)
             except Exception as e:
                 print(f"본문 입력 실패: {e}")
                 return False
             
             # 첫 번째 발행 버튼 클릭
-            time.sleep(3)
             try:
+                self._wait_step('publish_button_ready', EC.element_to_be_clickable(
+                    (By.CSS_SELECTOR, 'button.publish_btn__m9KHH')
+                ), timeout=10, required=False)
                 publish_script = """
                     var publishBtn = document.querySelector('button.publish_btn__m9KHH');
                     if (publishBtn) {
@@ -328,15 +626,14 @@ class NaverBlogPoster:
                 """
                 if self.driver.execute_script(publish_script):
                     print("- 첫 번째 발행 버튼 클릭 완료")
-                    time.sleep(3)
                     
                     # 카테고리 선택
                     try:
-                        # 도움말 이미지 닫기
-                        try:
-                            help_image = WebDriverWait(self.driver, 5).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, 'img.se-help-carousel-image'))
-                            )
+                        # 도움말 이미지 닫기 (나타나지 않는 경우가 많으므로 선택 단계로 기다림)
+                        help_image = self._wait_step('help_image_shown', EC.presence_of_element_located(
+                            (By.CSS_SELECTOR, 'img.se-help-carousel-image')
+                        ), timeout=2, required=False)
+                        if help_image is not None:
                             # JavaScript로 도움말 이미지 숨기기
                             self.driver.execute_script("""
                                 var helpImage = document.querySelector('img.se-help-carousel-image');
@@ -345,27 +642,27 @@ class NaverBlogPoster:
                                 }
                             """)
                             print("- 도움말 이미지 숨김 처리 완료")
-                            time.sleep(2)
-                        except:
+                        else:
                             print("도움말 이미지 없음 - 계속 진행")
                         
                         # 카테고리 목록 버튼 클릭
-                        category_button = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.selectbox_button__jb1Dt'))
-                        )
+                        category_button = self._wait_step('publish_layer_open', EC.element_to_be_clickable(
+                            (By.CSS_SELECTOR, 'button.selectbox_button__jb1Dt')
+                        ), timeout=10)
                         # JavaScript로 클릭
                         self.driver.execute_script("arguments[0].click();", category_button)
                         print("- 카테고리 목록 버튼 클릭 완료")
-                        time.sleep(2)
                         
                         # 출퇴근 환율분석 카테고리 선택
-                        category_label = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, 'label[for="15_출퇴근 환율분석"]'))
-                        )
+                        category_label = self._wait_step('category_list_open', EC.element_to_be_clickable(
+                            (By.CSS_SELECTOR, 'label[for="15_출퇴근 환율분석"]')
+                        ), timeout=10)
                         # JavaScript로 클릭
                         self.driver.execute_script("arguments[0].click();", category_label)
+                        self._wait_step('category_selected', lambda d: d.execute_script(
+                            "var input = document.getElementById('15_출퇴근 환율분석'); return !input || input.checked;"
+                        ), timeout=5, required=False)
                         print("- 출퇴근 환율분석 카테고리 선택 완료")
-                        time.sleep(2)
                         
                     except Exception as e:
                         print(f"카테고리 선택 실패: {e}")
@@ -374,18 +671,8 @@ class NaverBlogPoster:
                     # 태그 입력
                     if tags:
                         try:
-                            for tag in tags:
-                                tag_input = WebDriverWait(self.driver, 10).until(
-                                    EC.presence_of_element_located((By.CSS_SELECTOR, 'input#tag-input.tag_input__rvUB5'))
-                                )
-                                tag_input.clear()  # 기존 입력값 제거
-                                tag_input.send_keys(tag)
-                                time.sleep(0.5)
-                                tag_input.send_keys(Keys.ENTER)
-                                time.sleep(1)
-                                print(f"- 태그 입력 완료: {tag}")
-                            print("- 모든 태그 입력 완료")
-                            time.sleep(2)
+                            entered = self._enter_tags(tags)
+                            print(f"- 태그 입력 완료: {len(entered)}/{len(tags)}개 ({', '.join(entered)})")
                         except Exception as e:
                             print(f"태그 입력 실패: {e}")
                     
@@ -400,7 +687,8 @@ class NaverBlogPoster:
                     """
                     if self.driver.execute_script(final_publish_script):
                         print("- 최종 발행 버튼 클릭 완료")
-                        time.sleep(3)
+                        # 발행이 끝나면 글쓰기 페이지를 벗어남
+                        self._wait_step('published', lambda d: 'postwrite' not in d.current_url, timeout=15, required=False)
                         return True
                     else:
                         print("최종 발행 버튼을 찾을 수 없습니다")
@@ -413,6 +701,10 @@ class NaverBlogPoster:
         except Exception as e:
             print(f"포스팅 실패: {e}")
             return False
+        finally:
+            total = time.monotonic() - post_started
+            timings = ', '.join(f"{step} {elapsed:.2f}초" for step, elapsed in self.step_timings.items())
+            self.logger.info(f"포스팅 소요 시간: 총 {total:.2f}초 ({timings})")
 
     def manual_login(self) -> bool:
         """자동으로 로그인을 진행합니다."""
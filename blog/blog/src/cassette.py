@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CASSETTE_DIR = PROJECT_ROOT / 'data' / 'cassettes' / 'latest'
+
+# 녹화/재생 대상에서 제외하는 호스트 (로컬 픽스처 서버 등)
+PASSTHROUGH_HOSTS = {'localhost', '127.0.0.1'}
+
+# 재생 시 다시 계산되어야 하는 응답 헤더 (본문은 압축 해제된 상태로 저장)
+DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """재생 모드에서 녹화되지 않은 요청을 보냈을 때 발생합니다."""
+
+
+class Cassette:
+    """실제 실행의 외부 응답을 디렉터리에 녹화하고 같은 순서로 재생합니다.
+
+    HTTP 요청은 CassetteAdapter를 통해 응답 본문 그대로, yfinance/Google News처럼
+    자체 클라이언트를 쓰는 호출은 call()로 반환값을 pickle로 저장합니다.
+    재생 시 요청은 메서드+URL+본문 해시가 같은 녹화를 먼저 찾고, 없으면 같은
+    메서드+경로의 다음 녹화를 순서대로 사용합니다 (프롬프트에 시각이 들어가는 LLM 호출 등).
+    """
+
+    def __init__(self, config: dict = None):
+        self.logger = logging.getLogger(__name__)
+        settings = (config or {}).get('cassette', {})
+        self.mode = settings.get('mode', 'off')  # off, record, replay
+        cassette_dir = Path(settings.get('dir', DEFAULT_CASSETTE_DIR))
+        self.dir = cassette_dir if cassette_dir.is_absolute() else PROJECT_ROOT / cassette_dir
+        self.http_dir = self.dir / 'http'
+        self.calls_dir = self.dir / 'calls'
+        self.index_file = self.dir / 'http_index.jsonl'
+
+        self._lock = threading.Lock()
+        self._entries = []                      # 녹화 순서대로의 HTTP 항목
+        self._used = set()                      # 재생에 사용한 항목 번호
+        self._call_counts = defaultdict(int)    # call() 이름별 호출 순번
+
+        if self.mode == 'record':
+            self.http_dir.mkdir(parents=True, exist_ok=True)
+            self.calls_dir.mkdir(parents=True, exist_ok=True)
+            # 새로 녹화할 때는 이전 HTTP 색인을 비움
+            self.index_file.write_text('', encoding='utf-8')
+        elif self.mode == 'replay':
+            self._load_index()
+
+    @property
+    def active(self) -> bool:
+        return self.mode in ('record', 'replay')
+
+    def _load_index(self):
+        if not self.index_file.exists():
+            raise FileNotFoundError(f"카세트를 찾을 수 없습니다: {self.dir}")
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            self._entries = [json.loads(line) for line in f if line.strip()]
+        self.logger.info(f"카세트 재생: {self.dir} (HTTP 응답 {len(self._entries)}개)")
+
+    @staticmethod
+    def _request_key(request: requests.PreparedRequest) -> str:
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256(f"{request.method} {request.url}\n".encode('utf-8') + body)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _route(method: str, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{method} {parts.netloc}{parts.path}"
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response) -> requests.Response:
+        """응답 본문을 모두 읽어 저장하고, 이미 읽은 응답을 그대로 반환합니다."""
+        body = response.content
+        key = self._request_key(request)
+        entry = {
+            'key': key,
+            'route': self._route(request.method, request.url),
+            'url': request.url,
+            'status': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+        }
+        with self._lock:
+            entry['file'] = f"{len(self._entries):04d}-{key[:16]}.json"
+            self._entries.append(entry)
+            with open(self.http_dir / entry['file'], 'w', encoding='utf-8') as f:
+                json.dump({'body': base64.b64encode(body).decode('ascii')}, f)
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return response
+
+    def replay(self, request: requests.PreparedRequest, adapter: HTTPAdapter) -> requests.Response:
+        """요청에 해당하는 녹화 응답을 만들어 반환합니다."""
+        key = self._request_key(request)
+        route = self._route(request.method, request.url)
+        with self._lock:
+            candidates = [i for i, e in enumerate(self._entries) if i not in self._used and e['key'] == key]
+            if not candidates:
+                candidates = [i for i, e in enumerate(self._entries) if i not in self._used and e['route'] == route]
+            if not candidates:
+                raise CassetteMiss(f"카세트에 녹화되지 않은 요청: {request.method} {request.url}")
+            index = candidates[0]
+            self._used.add(index)
+            entry = self._entries[index]
+
+        with open(self.http_dir / entry['file'], 'r', encoding='utf-8') as f:
+            body = base64.b64decode(json.load(f)['body'])
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=dict(entry['headers'], **{'Content-Length': str(len(body))}),
+            status=entry['status'],
+            preload_content=False,
+            decode_content=False
+        )
+        return adapter.build_response(request, raw)
+
+    def call(self, name: str, func, *args, **kwargs):
+        """자체 HTTP 클라이언트를 쓰는 라이브러리 호출의 반환값을 녹화/재생합니다."""
+        if not self.active:
+            return func(*args, **kwargs)
+
+        with self._lock:
+            sequence = self._call_counts[name]
+            self._call_counts[name] += 1
+        path = self.calls_dir / f"{name}.{sequence:03d}.pkl"
+
+        if self.mode == 'replay':
+            if not path.exists():
+                # 녹화보다 많이 호출되면 마지막 녹화를 재사용
+                recorded = sorted(self.calls_dir.glob(f"{name}.*.pkl"))
+                if not recorded:
+                    raise CassetteMiss(f"카세트에 녹화되지 않은 호출: {name}")
+                path = recorded[-1]
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+        result = func(*args, **kwargs)
+        with open(path, 'wb') as f:
+            pickle.dump(result, f)
+        return result
+
+
+class CassetteAdapter(HTTPAdapter):
+    """공유 세션에 마운트되어 HTTP 응답을 녹화하거나 녹화본으로 응답하는 어댑터입니다."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if urlsplit(request.url).hostname in PASSTHROUGH_HOSTS:
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        if self.cassette.mode == 'replay':
+            return self.cassette.replay(request, self)
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        return self.cassette.record(request, response)
+
+
+def apply_cassette_config(config: dict, mode: str, directory: str, fixture_url: str = None) -> dict:
+    """녹화/재생 실행에 맞게 설정을 바꿉니다.
+
+    - LLM 응답 캐시를 끄고 매번 HTTP로 요청하여 응답이 카세트에 남도록 합니다.
+    - 시세 저장소와 브라우저 프로필, 쿠키 파일은 임시 디렉터리를 사용해 실제 데이터를 건드리지 않고
+      저장소 상태와 관계없이 매번 같은 요청을 보내도록 합니다.
+    - 재생 시 로그인/글쓰기 페이지는 로컬 픽스처 서버(fixture_url)를 사용합니다.
+    """
+    config['cassette'] = {'mode': mode, 'dir': str(Path(directory).resolve())}
+    config.setdefault('deepseek', {}).setdefault('cache', {})['enabled'] = False
+    config.setdefault('http', {})['http2'] = False
+
+    # 같은 프로세스에서 설정을 다시 읽어도 같은 임시 디렉터리를 사용
+    scratch = Path(tempfile.gettempdir()) / f"cassette-{mode}-{os.getpid()}"
+    config.setdefault('yahoo_finance', {})['store_dir'] = str(scratch / 'rates')
+    browser = config.setdefault('browser', {})
+    browser['user_data_dir'] = str(scratch / 'chrome-profile')
+    browser['cookies_file'] = str(scratch / 'naver_cookies.pkl')
+    # 실행 간 브라우저를 유지하지 않아 매 실행이 같은 조건에서 시작되도록 함
+    browser['persistent'] = False
+
+    if mode == 'replay' and fixture_url:
+        blog = config.setdefault('blog', {})
+        blog['url'] = f"{fixture_url}/blog"
+        blog['login_url'] = f"{fixture_url}/nidlogin.login"
+        blog['write_url'] = f"{fixture_url}/postwrite"
+        blog['cookie_origin'] = f"{fixture_url}/robots.txt"
+        blog['write_endpoint'] = f"{fixture_url}/RabbitWrite.naver"
+    return config
+
+
+_shared_cassette: Optional[Cassette] = None
+_shared_lock = threading.Lock()
+
+
+def get_cassette(config: dict = None) -> Cassette:
+    """프로세스 전체에서 공유하는 카세트를 반환합니다. 설정이 없으면 녹화/재생하지 않습니다."""
+    global _shared_cassette
+    with _shared_lock:
+        if _shared_cassette is None:
+            _shared_cassette = Cassette(config)
+        return _shared_cassette
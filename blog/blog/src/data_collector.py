@@ -1,12 +1,21 @@
-import requests
 from bs4 import BeautifulSoup
 import logging
-from typing import Dict, List
-import re
+from typing import Callable, Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 import yfinance as yf
 import pandas as pd
 from GoogleNews import GoogleNews
+from cassette import get_cassette
+from http_client import get_http_client
+from rate_store import RateHistoryStore
+from tracing import bind, trace_stage, traced
+
+NAVER_EXCHANGE_URL = "https://finance.naver.com/marketindex/exchangeDetail.naver?marketindexCd=FX_USDKRW"
+YAHOO_NEWS_URL = "https://finance.yahoo.com/quote/USDKRW=X/news"
+# USD/KRW 시세 저장소 이름 (설정 티커가 KRW=X로 바뀌어도 기존 기록 파일 USDKRW_X.npy를 계속 사용)
+RATE_STORE_TICKER = "USDKRW=X"
 
 class ExchangeRateCollector:
     def __init__(self, config: dict):
@@ -15,17 +24,54 @@ class ExchangeRateCollector:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # 커넥션 풀을 공유하는 HTTP 클라이언트
+        self.http = get_http_client(config)
+        # yfinance/GoogleNews는 자체 클라이언트를 사용하므로 반환값 단위로 녹화/재생
+        self.cassette = get_cassette(config)
+        # USD/KRW 시세 봉 데이터 로컬 저장소
+        yahoo_config = config.get('yahoo_finance', {})
+        self.usd_krw_ticker = yahoo_config.get('usd_krw_ticker', 'USDKRW=X')
+        self.rate_store = RateHistoryStore(RATE_STORE_TICKER, yahoo_config.get('store_dir'))
+        # 신규 수집에 실패했을 때 저장된 봉을 대신 사용할 수 있는 최대 경과 시간
+        self.max_stale_age = pd.Timedelta(hours=yahoo_config.get('max_stale_hours', 36))
+        # 일괄 수집 대상 통화 티커와 표시 이름
+        self.batch_ticker_names = yahoo_config.get('batch_tickers', {})
         # Google News 초기화
         self.gn = GoogleNews()
         self.gn.set_lang('en')
         self.gn.set_period('1d')  # 오늘 하루의 뉴스만 수집
+        # 동시 수집 설정 (소스별 제한 시간 포함)
+        self.concurrency_config = config.get('data_collection', {}).get('concurrency', {})
 
+    @traced('collect.exchange_data')
     def get_exchange_rate_data(self) -> Dict:
-        """야후 파이낸스에서 USD/KRW 환율 데이터를 수집합니다."""
+        """야후 파이낸스에서 USD/KRW 환율 데이터를 수집합니다.
+
+        로컬 시세 저장소에 마지막으로 저장된 봉 이후의 데이터만 새로 받아 병합하고,
+        변동폭은 저장소의 데이터로 계산합니다.
+        """
         try:
             # USD/KRW 환율 데이터 가져오기
-            ticker = yf.Ticker("USDKRW=X")  # USD/KRW 환율의 야후 파이낸스 심볼
-            hist = ticker.history(period="2d")  # 2일치 데이터를 가져와서 변동폭 계산
+            ticker = yf.Ticker(self.usd_krw_ticker)  # USD/KRW 환율의 야후 파이낸스 심볼
+            last_timestamp = self.rate_store.last_timestamp()
+            try:
+                if last_timestamp is None:
+                    # 저장소가 비어 있으면 설정된 기간만큼 과거 데이터를 한 번에 받음
+                    lookback_days = self.config.get('yahoo_finance', {}).get('lookback_days', 7)
+                    fetched = self.cassette.call('yfinance.history', ticker.history, period=f"{lookback_days}d")
+                else:
+                    # 마지막 봉부터 다시 받아 장중에 갱신된 값도 반영
+                    fetched = self.cassette.call('yfinance.history', ticker.history,
+                                                 start=last_timestamp.strftime('%Y-%m-%d'))
+                self.rate_store.append(fetched)
+            except Exception as e:
+                self.logger.warning(f"신규 환율 데이터 수집 실패, 저장된 데이터로 계산합니다: {str(e)}")
+                # 저장된 마지막 봉이 너무 오래되었으면 오늘 환율로 발행하지 않도록 중단
+                if last_timestamp is not None and pd.Timestamp.now(tz='UTC') - last_timestamp > self.max_stale_age:
+                    self.logger.error(f"저장된 환율 데이터가 오래되어 사용하지 않습니다 (마지막 봉: {last_timestamp})")
+                    return {}
+
+            hist = self.rate_store.to_frame().tail(2)  # 최근 2개 봉으로 변동폭 계산
             
             if hist.empty:
                 self.logger.error("환율 데이터를 찾을 수 없습니다.")
@@ -60,118 +106,265 @@ class ExchangeRateCollector:
             self.logger.error(f"환율 데이터 수집 중 오류: {str(e)}")
             return {}
 
+    def get_market_snapshot(self, tickers: List[str] = None) -> pd.DataFrame:
+        """여러 통화/지수 티커를 한 번의 일괄 요청으로 수집하고 변동폭을 계산합니다.
+
+        반환값은 티커별 한 행의 DataFrame이며 Name, Close, Change, ChangePercent, Date 열을 가집니다.
+        """
+        try:
+            tickers = tickers or self._batch_tickers()
+            if not tickers:
+                return pd.DataFrame()
+
+            history_days = self.config.get('data_collection', {}).get('yfinance', {}).get('history_days', 5)
+            data = self.cassette.call('yfinance.download', yf.download, tickers, period=f"{history_days}d",
+                                      group_by='column', auto_adjust=False, threads=True, progress=False)
+            if data.empty:
+                self.logger.error("일괄 시세 데이터를 찾을 수 없습니다.")
+                return pd.DataFrame()
+
+            if isinstance(data.columns, pd.MultiIndex):
+                closes = data['Close']
+            else:
+                closes = data[['Close']].rename(columns={'Close': tickers[0]})
+
+            # 티커마다 휴장일이 다르므로 결측을 제외한 마지막 2개 종가로 티커별 변동폭 계산
+            # (stack()은 pandas 버전마다 결측 처리 방식이 달라 경고가 나므로 melt로 긴 형태로 바꿈)
+            long = closes.rename_axis(index='Date', columns=None).reset_index().melt(
+                id_vars='Date', var_name='Ticker', value_name='Close').dropna()
+            grouped = long.sort_values('Date').groupby('Ticker').tail(2).groupby('Ticker')
+            latest = grouped['Close'].last()
+            previous = grouped['Close'].first()
+            change = latest - previous
+
+            names = {self.usd_krw_ticker: 'USD/KRW', **self.batch_ticker_names}
+            snapshot = pd.DataFrame({
+                'Name': latest.index.map(lambda t: names.get(t, t)),
+                'Close': latest,
+                'Change': change,
+                'ChangePercent': change / previous * 100,
+                'Date': grouped['Date'].max()
+            })
+            snapshot.index.name = 'Ticker'
+
+            missing = [t for t in tickers if t not in snapshot.index]
+            if missing:
+                self.logger.warning(f"일괄 수집에서 누락된 티커: {', '.join(missing)}")
+            self.logger.info(f"일괄 시세 수집 완료: {len(snapshot)}/{len(tickers)}개 티커")
+            return snapshot
+
+        except Exception as e:
+            self.logger.error(f"일괄 시세 수집 중 오류: {str(e)}")
+            return pd.DataFrame()
+
+    def _batch_tickers(self) -> List[str]:
+        """설정 파일의 통화 티커와 지수 목록을 합쳐 일괄 수집 대상을 만듭니다."""
+        tickers = [self.usd_krw_ticker] + list(self.batch_ticker_names)
+        tickers += self.config.get('data_collection', {}).get('yfinance', {}).get('indices', [])
+        # 순서를 유지하며 중복 제거
+        return list(dict.fromkeys(tickers))
+
+    @traced('collect.news')
     def get_exchange_rate_news(self) -> List[Dict]:
         """네이버 금융, Yahoo Finance, Google News에서 환율 관련 뉴스를 수집합니다."""
         try:
-            news_items = []
-            
-            # 1. 네이버 금융 뉴스 수집
-            exchange_url = "https://finance.naver.com/marketindex/exchangeDetail.naver?marketindexCd=FX_USDKRW"
-            response = requests.get(exchange_url, headers=self.headers)
-            response.encoding = 'euc-kr'
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            news_list = soup.select('#content > div.section_news._replaceNewsLink > ul > li')
-            
-            for news in news_list[:3]:  # 최근 3개 뉴스만 수집
-                title_element = news.select_one('dl > dt > a')
-                content_element = news.select_one('dl > dd')
-                
-                if all([title_element, content_element]):
-                    title = title_element.text.strip()
-                    link = title_element.get('href')
-                    if link and not link.startswith('http'):
-                        link = f"https://finance.naver.com{link}"
-                    
-                    content = content_element.text.strip()
-                    date = datetime.now()
-                    
-                    news_items.append({
-                        'title': title,
-                        'content': content,
-                        'link': link,
-                        'time': date,
-                        'source': '네이버 금융',
-                        'importance': 'high'  # 네이버 금융 뉴스는 중요도가 높음
-                    })
-            
-            # 2. Yahoo Finance 뉴스 수집
-            yahoo_url = "https://finance.yahoo.com/quote/USDKRW=X/news"
-            response = requests.get(yahoo_url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            yahoo_news = soup.select('div[data-test="content-viewer"] article')
-            for news in yahoo_news[:3]:  # 최근 3개 뉴스만 수집
-                title_element = news.select_one('h3 a')
-                content_element = news.select_one('p')
-                
-                if all([title_element, content_element]):
-                    title = title_element.text.strip()
-                    link = title_element.get('href')
-                    if link and not link.startswith('http'):
-                        link = f"https://finance.yahoo.com{link}"
-                    
-                    content = content_element.text.strip()
-                    date = datetime.now()
-                    
-                    news_items.append({
-                        'title': title,
-                        'content': content,
-                        'link': link,
-                        'time': date,
-                        'source': 'Yahoo Finance',
-                        'importance': 'high'  # Yahoo Finance 뉴스도 중요도가 높음
-                    })
-            
-            # 3. Google News 뉴스 수집
-            try:
-                # Google News 설정
-                self.gn.clear()
-                self.gn.set_time_range(start=datetime.now().strftime("%m/%d/%Y"))
-                self.gn.get_news()
-                
-                # 결과를 DataFrame으로 변환
-                results = self.gn.results()
-                if results:
-                    df = pd.DataFrame(results)[['title', 'datetime']]
-                    df['date'] = df['datetime'].dt.date
-                    
-                    # 중요 키워드 정의
-                    priority_keywords = {
-                        'high': ['tariff', 'trade', 'fed', 'interest rate', 'inflation', 'economy', 'market', 'exchange rate', 'USD/KRW'],
-                        'medium': ['earnings', 'stock', 'company', 'industry', 'export', 'import'],
-                        'low': ['product', 'service', 'individual stock']
-                    }
-                    
-                    # 뉴스 데이터 변환
-                    for _, row in df.iterrows():
-                        title = row['title']
-                        
-                        # 뉴스 중요도 평가
-                        importance = 'low'
-                        for level, keywords in priority_keywords.items():
-                            if any(keyword.lower() in title.lower() for keyword in keywords):
-                                importance = level
-                                break
-                        
-                        news_items.append({
-                            'title': title,
-                            'content': '',  # Google News는 본문이 없음
-                            'link': '',  # Google News는 링크가 없음
-                            'time': row['date'].strftime('%Y-%m-%d'),
-                            'source': 'Google News',
-                            'importance': importance
-                        })
-            except Exception as e:
-                self.logger.error(f"Google News 수집 중 오류: {str(e)}")
-            
-            # 중요도에 따라 정렬
-            importance_order = {'high': 0, 'medium': 1, 'low': 2}
-            news_items.sort(key=lambda x: importance_order[x['importance']])
-            
-            self.logger.info(f"수집된 뉴스: {len(news_items)}개 (네이버 금융: {len(news_list[:3])}개, Yahoo Finance: {len(yahoo_news[:3])}개, Google News: {len(news_items) - len(news_list[:3]) - len(yahoo_news[:3])}개)")
-            return news_items
-            
+            results = self._run_concurrently({
+                'naver': self._fetch_naver_news,
+                'yahoo': self._fetch_yahoo_news,
+                'google': self._fetch_google_news,
+            })
+            return self._merge_news(results)
+
         except Exception as e:
             self.logger.error(f"뉴스 데이터 수집 중 오류: {str(e)}")
             return []
+
+    def collect_all(self) -> Dict:
+        """환율 데이터와 모든 뉴스 소스를 동시에 수집합니다.
+
+        각 소스는 개별 제한 시간을 가지며, 시간 안에 끝나지 않거나 실패한 소스는
+        제외하고 나머지 결과만으로 진행합니다.
+        """
+        results = self._run_concurrently({
+            'exchange_data': self.get_exchange_rate_data,
+            'naver': self._fetch_naver_news,
+            'yahoo': self._fetch_yahoo_news,
+            'google': self._fetch_google_news,
+            'market_snapshot': self.get_market_snapshot,
+        })
+        snapshot = results.get('market_snapshot')
+        return {
+            'exchange_data': results.get('exchange_data') or {},
+            'news': self._merge_news(results),
+            'market_snapshot': snapshot if snapshot is not None else pd.DataFrame()
+        }
+
+    def _source_timeout(self, name: str) -> float:
+        """소스별 수집 제한 시간(초)을 반환합니다."""
+        timeouts = self.concurrency_config.get('source_timeouts', {})
+        return timeouts.get(name, self.concurrency_config.get('default_timeout', 15))
+
+    def _run_concurrently(self, tasks: Dict[str, Callable]) -> Dict:
+        """여러 수집 작업을 스레드 풀에서 동시에 실행하고 완료된 결과만 반환합니다."""
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix='collector')
+        started = time.monotonic()
+        futures = {name: executor.submit(bind(self._traced_source), name, func) for name, func in tasks.items()}
+        results = {}
+
+        try:
+            for name, future in futures.items():
+                remaining = self._source_timeout(name) - (time.monotonic() - started)
+                try:
+                    results[name] = future.result(timeout=max(remaining, 0))
+                except FutureTimeoutError:
+                    future.cancel()
+                    self.logger.warning(f"{name} 수집 시간 초과 ({self._source_timeout(name)}초) - 해당 소스 제외")
+                except Exception as e:
+                    self.logger.error(f"{name} 수집 중 오류: {str(e)}")
+        finally:
+            # 시간 초과된 작업을 기다리지 않고 반환
+            executor.shutdown(wait=False)
+
+        self.logger.info(f"동시 수집 완료: {len(results)}/{len(tasks)}개 소스, {time.monotonic() - started:.2f}초")
+        return results
+
+    @staticmethod
+    def _traced_source(name: str, func: Callable):
+        """작업 스레드에서 소스 하나의 수집 구간을 측정합니다."""
+        with trace_stage(f'source.{name}'):
+            return func()
+
+    def _merge_news(self, results: Dict) -> List[Dict]:
+        """소스별 뉴스를 하나로 합치고 중요도 순으로 정렬합니다."""
+        naver_news = results.get('naver') or []
+        yahoo_news = results.get('yahoo') or []
+        google_news = results.get('google') or []
+        news_items = naver_news + yahoo_news + google_news
+
+        # 중요도에 따라 정렬
+        importance_order = {'high': 0, 'medium': 1, 'low': 2}
+        news_items.sort(key=lambda x: importance_order[x['importance']])
+
+        self.logger.info(f"수집된 뉴스: {len(news_items)}개 (네이버 금융: {len(naver_news)}개, Yahoo Finance: {len(yahoo_news)}개, Google News: {len(google_news)}개)")
+        return news_items
+
+    def _fetch_naver_news(self) -> List[Dict]:
+        """네이버 금융 환율 페이지에서 뉴스를 수집합니다."""
+        exchange_url = self.config.get('naver_finance', {}).get('exchange_rate_url', NAVER_EXCHANGE_URL)
+        response = self.http.get(exchange_url, headers=self.headers, timeout=self._source_timeout('naver'))
+        response.encoding = 'euc-kr'
+        return self._parse_naver_news(response.text)
+
+    def _parse_naver_news(self, html: str) -> List[Dict]:
+        """네이버 금융 페이지 HTML에서 뉴스 항목을 추출합니다."""
+        news_items = []
+        soup = BeautifulSoup(html, 'html.parser')
+
+        news_list = soup.select('#content > div.section_news._replaceNewsLink > ul > li')
+
+        for news in news_list[:3]:  # 최근 3개 뉴스만 수집
+            title_element = news.select_one('dl > dt > a')
+            content_element = news.select_one('dl > dd')
+
+            if all([title_element, content_element]):
+                title = title_element.text.strip()
+                link = title_element.get('href')
+                if link and not link.startswith('http'):
+                    link = f"https://finance.naver.com{link}"
+
+                content = content_element.text.strip()
+                date = datetime.now()
+
+                news_items.append({
+                    'title': title,
+                    'content': content,
+                    'link': link,
+                    'time': date,
+                    'source': '네이버 금융',
+                    'importance': 'high'  # 네이버 금융 뉴스는 중요도가 높음
+                })
+
+        return news_items
+
+    def _fetch_yahoo_news(self) -> List[Dict]:
+        """Yahoo Finance 환율 뉴스 페이지에서 뉴스를 수집합니다."""
+        response = self.http.get(YAHOO_NEWS_URL, headers=self.headers, timeout=self._source_timeout('yahoo'))
+        return self._parse_yahoo_news(response.text)
+
+    def _parse_yahoo_news(self, html: str) -> List[Dict]:
+        """Yahoo Finance 페이지 HTML에서 뉴스 항목을 추출합니다."""
+        news_items = []
+        soup = BeautifulSoup(html, 'html.parser')
+
+        yahoo_news = soup.select('div[data-test="content-viewer"] article')
+        for news in yahoo_news[:3]:  # 최근 3개 뉴스만 수집
+            title_element = news.select_one('h3 a')
+            content_element = news.select_one('p')
+
+            if all([title_element, content_element]):
+                title = title_element.text.strip()
+                link = title_element.get('href')
+                if link and not link.startswith('http'):
+                    link = f"https://finance.yahoo.com{link}"
+
+                content = content_element.text.strip()
+                date = datetime.now()
+
+                news_items.append({
+                    'title': title,
+                    'content': content,
+                    'link': link,
+                    'time': date,
+                    'source': 'Yahoo Finance',
+                    'importance': 'high'  # Yahoo Finance 뉴스도 중요도가 높음
+                })
+
+        return news_items
+
+    def _google_news_results(self) -> List[Dict]:
+        """Google News에서 오늘 날짜의 검색 결과를 받아옵니다."""
+        self.gn.clear()
+        self.gn.set_time_range(start=datetime.now().strftime("%m/%d/%Y"))
+        self.gn.get_news()
+        return self.gn.results()
+
+    def _fetch_google_news(self) -> List[Dict]:
+        """Google News에서 오늘의 뉴스를 수집하고 중요도를 평가합니다."""
+        news_items = []
+
+        # 결과를 DataFrame으로 변환
+        results = self.cassette.call('google_news.results', self._google_news_results)
+        if not results:
+            return news_items
+
+        df = pd.DataFrame(results)[['title', 'datetime']]
+        df['date'] = df['datetime'].dt.date
+
+        # 중요 키워드 정의
+        priority_keywords = {
+            'high': ['tariff', 'trade', 'fed', 'interest rate', 'inflation', 'economy', 'market', 'exchange rate', 'USD/KRW'],
+            'medium': ['earnings', 'stock', 'company', 'industry', 'export', 'import'],
+            'low': ['product', 'service', 'individual stock']
+        }
+
+        # 뉴스 데이터 변환
+        for _, row in df.iterrows():
+            title = row['title']
+
+            # 뉴스 중요도 평가
+            importance = 'low'
+            for level, keywords in priority_keywords.items():
+                if any(keyword.lower() in title.lower() for keyword in keywords):
+                    importance = level
+                    break
+
+            news_items.append({
+                'title': title,
+                'content': '',  # Google News는 본문이 없음
+                'link': '',  # Google News는 링크가 없음
+                'time': row['date'].strftime('%Y-%m-%d'),
+                'source': 'Google News',
+                'importance': importance
+            })
+
+        return news_items
@@ -0,0 +1,308 @@
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+FIXTURES_DIR = Path(__file__).parent.parent / 'fixtures'
+
+# 스텁 서버 기본 동작 (모든 비율은 0~1 사이 확률)
+DEFAULT_STUB_SETTINGS = {
+    'latency': 0.0,           # 응답 전 고정 지연 (초)
+    'latency_jitter': 0.0,    # 고정 지연에 더할 무작위 지연의 최대값 (초)
+    'token_delay': 0.0,       # 스트리밍 토큰 사이 지연 (초)
+    'chunk_chars': 8,         # 스트리밍 토큰 하나의 글자 수
+    'error_rate': 0.0,        # 오류 상태 코드로 응답할 비율
+    'error_statuses': [429, 500, 503],
+    'fail_first': 0,          # 처음 N개 요청은 항상 오류로 응답 (재시도 검증용)
+    'timeout_rate': 0.0,      # 응답하지 않고 hang_seconds 동안 대기할 비율
+    'stall_rate': 0.0,        # 스트리밍 도중 응답을 멈추고 hang_seconds 동안 대기할 비율
+    'hang_seconds': 120.0,
+    'seed': None,
+}
+
+ERROR_MESSAGES = {
+    429: ('rate_limit_error', 'Rate limit reached for requests'),
+    500: ('server_error', 'The server had an error while processing your request'),
+    502: ('server_error', 'Bad gateway'),
+    503: ('server_error', 'The server is overloaded or not ready yet'),
+}
+
+
+class StubState:
+    """스텁 서버의 설정, 난수 생성기, 결과별 요청 수를 보관합니다."""
+
+    def __init__(self, settings: Dict = None):
+        self.settings = dict(DEFAULT_STUB_SETTINGS)
+        self.settings.update(settings or {})
+        self.random = random.Random(self.settings['seed'])
+        self.commentary = (FIXTURES_DIR / 'commentary.txt').read_text(encoding='utf-8')
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.outcomes = defaultdict(int)
+
+    def next_outcome(self, stream: bool) -> str:
+        """이번 요청에 적용할 결과(ok, error, timeout, stall)를 정합니다."""
+        settings = self.settings
+        with self.lock:
+            self.requests += 1
+            if self.requests <= settings['fail_first']:
+                return 'error'
+            roll = self.random.random()
+        if roll < settings['timeout_rate']:
+            return 'timeout'
+        roll -= settings['timeout_rate']
+        if roll < settings['error_rate']:
+            return 'error'
+        roll -= settings['error_rate']
+        if stream and roll < settings['stall_rate']:
+            return 'stall'
+        return 'ok'
+
+    def record(self, outcome: str):
+        with self.lock:
+            self.outcomes[outcome] += 1
+
+    def latency(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(0, self.settings['latency_jitter'])
+        return self.settings['latency'] + jitter
+
+    def error_status(self) -> int:
+        with self.lock:
+            return self.random.choice(self.settings['error_statuses'])
+
+    def completion_text(self, payload: Dict) -> str:
+        """요청 종류(JSON 단일 호출, 제목, 이어쓰기, 본문)에 맞는 응답 본문을 만듭니다."""
+        messages = payload.get('messages', [])
+        prompt = messages[-1].get('content', '') if messages else ''
+        now = datetime.now(KST)
+        title = f"[{now.strftime('%m/%d %H:%M')} 환율분석] 원달러 1,384.5원, 달러 강세에 상승"
+
+        if (payload.get('response_format') or {}).get('type') == 'json_object':
+            return json.dumps({
+                'title': title,
+                'commentary': self.commentary,
+                'tags': ['환율', '원달러', '달러인덱스', '외환시장', '미국금리']
+            }, ensure_ascii=False)
+        if '제목을 작성해주세요' in prompt:
+            return title
+        if any(message.get('role') == 'assistant' for message in messages):
+            # 중단된 응답 이어쓰기 요청이면 본문의 뒷부분만 반환
+            return self.commentary[len(self.commentary) // 2:]
+        return self.commentary
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI 호환 /v1/chat/completions 요청을 처리합니다."""
+
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self) -> StubState:
+        return self.server.state
+
+    def do_GET(self):
+        if self.path == '/stats':
+            with self.state.lock:
+                body = {'requests': self.state.requests, 'outcomes': dict(self.state.outcomes)}
+            self._send_json(200, body)
+            return
+        self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+        try:
+            payload = json.loads(raw or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': 'invalid JSON body', 'type': 'invalid_request_error'}})
+            return
+
+        stream = bool(payload.get('stream'))
+        outcome = self.state.next_outcome(stream)
+        self.state.record(outcome)
+        time.sleep(self.state.latency())
+
+        if outcome == 'timeout':
+            time.sleep(self.state.settings['hang_seconds'])
+            self.close_connection = True
+            return
+        if outcome == 'error':
+            self._send_error_status(self.state.error_status())
+            return
+
+        content = self.state.completion_text(payload)
+        if stream:
+            self._send_stream(payload, content, stall=outcome == 'stall')
+        else:
+            self._send_json(200, self._completion(payload, content))
+
+    def _completion(self, payload: Dict, content: str) -> Dict:
+        prompt_chars = sum(len(m.get('content', '')) for m in payload.get('messages', []))
+        return {
+            'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'deepseek-chat'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            # 토큰 수는 글자 수로 대략 추정
+            'usage': {
+                'prompt_tokens': prompt_chars // 2,
+                'completion_tokens': len(content) // 2,
+                'total_tokens': (prompt_chars + len(content)) // 2
+            }
+        }
+
+    def _send_stream(self, payload: Dict, content: str, stall: bool = False):
+        """SSE 청크로 토큰을 나누어 보냅니다. stall이면 중간에 응답을 멈춥니다."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        size = self.state.settings['chunk_chars']
+        tokens = [content[i:i + size] for i in range(0, len(content), size)]
+        stall_at = len(tokens) // 2 if stall else None
+        try:
+            for index, token in enumerate(tokens):
+                if index == stall_at:
+                    time.sleep(self.state.settings['hang_seconds'])
+                    self.close_connection = True
+                    return
+                self._write_event(self._chunk(completion_id, payload, {'content': token}, None))
+                if self.state.settings['token_delay']:
+                    time.sleep(self.state.settings['token_delay'])
+            self._write_event(self._chunk(completion_id, payload, {}, 'stop'))
+            self._write_chunk(b'data: [DONE]\n\n')
+            self._write_chunk(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우
+            self.close_connection = True
+
+    @staticmethod
+    def _chunk(completion_id: str, payload: Dict, delta: Dict, finish_reason) -> Dict:
+        return {
+            'id': completion_id,
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': payload.get('model', 'deepseek-chat'),
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+        }
+
+    def _write_event(self, data: Dict):
+        self._write_chunk(f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_error_status(self, status: int):
+        error_type, message = ERROR_MESSAGES.get(status, ('server_error', 'Injected error'))
+        headers = {'Retry-After': '1'} if status == 429 else {}
+        self._send_json(status, {'error': {'message': message, 'type': error_type}}, headers)
+
+    def _send_json(self, status: int, body: Dict, headers: Dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).debug(format % args)
+
+
+class DeepSeekStubServer:
+    """DeepSeek(OpenAI 호환) API를 흉내 내는 로컬 서버입니다.
+
+    지연, 타임아웃, 429/5xx 오류, 스트리밍 중단을 설정한 비율로 주입하여 재시도/백오프 로직과
+    파이프라인 처리량을 토큰 비용 없이 측정할 수 있습니다.
+    """
+
+    def __init__(self, port: int = 0, settings: Dict = None):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = StubState(settings)
+        self.thread = None
+
+    @property
+    def state(self) -> StubState:
+        return self.httpd.state
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def start(self) -> 'DeepSeekStubServer':
+        """백그라운드 스레드에서 서버를 시작합니다."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='deepseek-stub', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def parse_statuses(value: str) -> List[int]:
+    return [int(status) for status in value.split(',') if status.strip()]
+
+
+if __name__ == "__main__":
+    # 사용 예: python deepseek_stub.py --latency 2 --error-rate 0.2 --token-delay 0.01
+    # 이후 config.yaml의 deepseek.api_url을 출력된 주소로 설정
+    parser = argparse.ArgumentParser(description="DeepSeek 호환 로컬 스텁 서버 (지연/오류 주입)")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.0, help="응답 전 고정 지연 (초)")
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="추가 무작위 지연 최대값 (초)")
+    parser.add_argument('--token-delay', type=float, default=0.0, help="스트리밍 토큰 사이 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument('--error-statuses', type=parse_statuses, default=[429, 500, 503], help="주입할 상태 코드 (예: 429,503)")
+    parser.add_argument('--fail-first', type=int, default=0, help="처음 N개 요청은 항상 오류로 응답")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="응답하지 않을 비율 (0~1)")
+    parser.add_argument('--stall-rate', type=float, default=0.0, help="스트리밍 도중 멈출 비율 (0~1)")
+    parser.add_argument('--hang-seconds', type=float, default=120.0, help="타임아웃/중단 주입 시 대기 시간 (초)")
+    parser.add_argument('--seed', type=int, default=None, help="오류 주입 난수 시드")
+    args = parser.parse_args()
+
+    server = DeepSeekStubServer(args.port, {
+        'latency': args.latency,
+        'latency_jitter': args.latency_jitter,
+        'token_delay': args.token_delay,
+        'error_rate': args.error_rate,
+        'error_statuses': args.error_statuses,
+        'fail_first': args.fail_first,
+        'timeout_rate': args.timeout_rate,
+        'stall_rate': args.stall_rate,
+        'hang_seconds': args.hang_seconds,
+        'seed': args.seed,
+    })
+    print(f"DeepSeek 스텁 서버 실행 중: {server.api_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"요청 결과: {dict(server.state.outcomes)}")
@@ -0,0 +1,141 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from blog_poster import NaverBlogPoster
+
+
+class DriverManager:
+    """예약 실행 사이에 로그인된 브라우저 하나를 계속 유지하는 관리자입니다.
+
+    acquire()는 상태 점검을 거친 로그인 상태의 NaverBlogPoster를 반환하고, 브라우저가
+    응답하지 않으면 다시 띄웁니다. 오래 쉬었거나 정해진 횟수만큼 사용한 브라우저는
+    새로 시작하여 메모리 누수와 세션 만료를 피합니다.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        settings = config.get('browser', {})
+        self.persistent = settings.get('persistent', True)
+        self.idle_recycle_seconds = settings.get('idle_recycle_minutes', 240) * 60
+        self.max_runs = settings.get('max_runs_per_driver', 8)
+        # 이 시간 안에 로그인 상태를 확인했으면 재사용 시 다시 확인하지 않음 (초)
+        self.login_check_interval = settings.get('login_check_interval_seconds', 300)
+
+        self.poster: Optional[NaverBlogPoster] = None
+        self.runs = 0
+        self.last_used = None
+        self.verified_at = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def acquire(self) -> Optional[NaverBlogPoster]:
+        """로그인된 브라우저를 반환합니다. 준비에 실패하면 None을 반환합니다."""
+        with self._lock:
+            if self.poster is not None:
+                reason = self._recycle_reason()
+                if reason:
+                    self.logger.info(f"브라우저 재시작: {reason}")
+                    self._shutdown()
+
+            if self.poster is not None:
+                print("- 기존 브라우저 세션 재사용")
+                # 직전에 로그인 상태를 확인했으면 다시 확인하지 않음
+                if not self._recently_verified() and not self.poster.check_login_status():
+                    print("- 로그인 세션 만료, 다시 로그인합니다.")
+                    if not self.poster.ensure_login():
+                        self._shutdown()
+                        return None
+            elif not self._start():
+                return None
+
+            self.runs += 1
+            self.verified_at = time.monotonic()
+            return self.poster
+
+    def warm_up(self) -> bool:
+        """브라우저를 띄우고 로그인까지 마쳐 둡니다. 사용 횟수에는 포함하지 않습니다."""
+        poster = self.acquire()
+        with self._lock:
+            self.runs = max(self.runs - 1, 0)
+        self.release(failed=poster is None)
+        return poster is not None
+
+    def release(self, failed: bool = False):
+        """사용을 마친 브라우저를 반납합니다. 실패한 실행의 브라우저는 상태를 알 수 없으므로 종료합니다."""
+        with self._lock:
+            self.last_used = time.monotonic()
+            if failed or not self.persistent:
+                self._shutdown()
+
+    def is_healthy(self) -> bool:
+        """브라우저 프로세스와 WebDriver 세션이 응답하는지 확인합니다."""
+        if self.poster is None or self.poster.driver is None:
+            return False
+        try:
+            self.poster.driver.execute_script('return document.readyState')
+            return len(self.poster.driver.window_handles) > 0
+        except WebDriverException:
+            return False
+
+    def shutdown(self):
+        """관리 중인 브라우저를 종료합니다."""
+        with self._lock:
+            self._shutdown()
+
+    def _recently_verified(self) -> bool:
+        return self.verified_at is not None and time.monotonic() - self.verified_at < self.login_check_interval
+
+    def _recycle_reason(self) -> Optional[str]:
+        """브라우저를 새로 시작해야 하는 이유를 반환합니다. 필요 없으면 None."""
+        if not self.is_healthy():
+            return "브라우저가 응답하지 않음"
+        if self.runs >= self.max_runs:
+            return f"최대 사용 횟수({self.max_runs}회) 도달"
+        if self.last_used is not None and time.monotonic() - self.last_used > self.idle_recycle_seconds:
+            return f"유휴 시간 {self.idle_recycle_seconds // 60}분 초과"
+        return None
+
+    def _start(self) -> bool:
+        """새 브라우저를 띄우고 로그인합니다."""
+        poster = NaverBlogPoster(self.config)
+        print("- 웹드라이버 설정 중...")
+        if not poster.setup_driver():
+            print("✗ 웹드라이버 설정에 실패했습니다.")
+            return False
+
+        print("- 네이버 로그인 시도 중...")
+        if not poster.ensure_login():
+            print("✗ 네이버 로그인 실패")
+            poster.close()
+            return False
+
+        self.poster = poster
+        self.runs = 0
+        self.last_used = None
+        return True
+
+    def _shutdown(self):
+        if self.poster is not None:
+            self.poster.close()
+            self.poster = None
+        self.runs = 0
+        self.verified_at = None
+
+
+_shared_manager: Optional[DriverManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_driver_manager(config: dict) -> DriverManager:
+    """프로세스 전체에서 공유하는 브라우저 관리자를 반환합니다."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = DriverManager(config)
+        return _shared_manager
@@ -0,0 +1,88 @@
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent.parent / 'fixtures'
+
+# 경로별로 응답할 픽스처 파일 (네이버 로그인/블로그/글쓰기 화면 대체)
+PAGES = {
+    '/nidlogin.login': 'login.html',
+    '/blog': 'blog.html',
+    '/postwrite': 'editor.html',
+    '/published': 'published.html',
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """픽스처 HTML과 글쓰기 엔드포인트의 성공 응답을 돌려주는 요청 처리기입니다."""
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/robots.txt':
+            self._send(200, b'User-agent: *\n', 'text/plain; charset=utf-8')
+            return
+        page = PAGES.get(path)
+        if page is None:
+            self._send(404, b'not found', 'text/plain; charset=utf-8')
+            return
+        self._send(200, (self.server.fixtures_dir / page).read_bytes(), 'text/html; charset=utf-8')
+
+    def do_POST(self):
+        # 본문은 읽어서 버리고 RabbitWrite.naver의 성공 응답 형식으로 답함
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path.split('?', 1)[0] != '/RabbitWrite.naver':
+            self._send(404, b'not found', 'text/plain; charset=utf-8')
+            return
+        body = json.dumps({'isSuccess': True, 'result': {'redirectUrl': '/published'}})
+        self._send(200, body.encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).debug(format % args)
+
+
+class FixtureServer:
+    """녹화 재생/벤치마크용으로 로그인·글쓰기 화면을 제공하는 로컬 HTTP 서버입니다."""
+
+    def __init__(self, port: int = 0, fixtures_dir: Path = FIXTURES_DIR):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+        self.httpd.fixtures_dir = Path(fixtures_dir)
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FixtureServer':
+        """백그라운드 스레드에서 서버를 시작합니다."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    # 사용 예: python fixture_server.py --port 8765
+    parser = argparse.ArgumentParser(description="로그인/글쓰기 화면 픽스처 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.port)
+    print(f"픽스처 서버 실행 중: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
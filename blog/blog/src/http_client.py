@@ -0,0 +1,191 @@
+import functools
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import tracing
+from cassette import CassetteAdapter, get_cassette
+
+try:
+    import httpx  # HTTP/2 사용 시에만 필요 (pip install httpx[http2])
+except ImportError:
+    httpx = None
+
+# 기본 HTTP 클라이언트 설정
+DEFAULT_HTTP_CONFIG = {
+    'pool_connections': 10,     # 호스트별 커넥션 풀 개수
+    'pool_maxsize': 10,         # 풀 하나당 최대 유지 커넥션 수
+    'max_retries': 3,           # 연결 오류/5xx 응답 재시도 횟수
+    'backoff_factor': 0.5,      # 재시도 간격 (0.5, 1, 2초 ...)
+    'retry_status': [429, 500, 502, 503, 504],
+    'http2': False              # httpx가 설치된 경우에만 사용
+}
+
+
+class HttpClient:
+    """커넥션 풀과 keep-alive를 공유하는 HTTP 클라이언트입니다."""
+
+    def __init__(self, config: dict = None):
+        self.logger = logging.getLogger(__name__)
+        self.settings = dict(DEFAULT_HTTP_CONFIG)
+        self.settings.update((config or {}).get('http', {}))
+        self._lock = threading.Lock()
+        self._request_counts = defaultdict(int)
+        # 녹화/재생 실행이면 모든 응답이 카세트를 거치도록 함
+        self.cassette = get_cassette(config)
+
+        self.session = requests.Session()
+        self.adapter = self._create_adapter()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self.http2_client = None
+        if self.settings['http2'] and not self.cassette.active:
+            if httpx is None:
+                self.logger.warning("httpx가 설치되지 않아 HTTP/1.1 세션을 사용합니다.")
+            else:
+                # httpx 전송 계층은 연결 실패만 재시도하므로 상태 코드 재시도는 호출자가 처리
+                self.http2_client = httpx.Client(transport=httpx.HTTPTransport(
+                    http2=True,
+                    retries=self.settings['max_retries'],
+                    limits=httpx.Limits(
+                        max_connections=self.settings['pool_connections'] * self.settings['pool_maxsize'],
+                        max_keepalive_connections=self.settings['pool_maxsize']
+                    )
+                ))
+        # HTTP/2 경로의 호스트별 요청 수와 새로 연 커넥션 수 (urllib3 풀 통계에 포함되지 않음)
+        self._http2_counts = defaultdict(lambda: {'requests': 0, 'connections': 0})
+
+    def _create_adapter(self) -> HTTPAdapter:
+        """재시도 정책이 적용된 커넥션 풀 어댑터를 생성합니다."""
+        retry = Retry(
+            total=self.settings['max_retries'],
+            backoff_factor=self.settings['backoff_factor'],
+            status_forcelist=self.settings['retry_status'],
+            raise_on_status=False  # 재시도 후 최종 응답은 호출자가 상태 코드로 처리
+        )
+        adapter_class = HTTPAdapter
+        if self.cassette.active:
+            adapter_class = functools.partial(CassetteAdapter, self.cassette)
+        return adapter_class(
+            pool_connections=self.settings['pool_connections'],
+            pool_maxsize=self.settings['pool_maxsize'],
+            max_retries=retry
+        )
+
+    def request(self, method: str, url: str, **kwargs):
+        """HTTP 요청을 보냅니다. 스트리밍 요청은 항상 requests 세션을 사용합니다."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._request_counts[host] += 1
+
+        if self.http2_client is not None and not kwargs.get('stream'):
+            response = self._request_http2(host, method, url, **kwargs)
+            tracing.add_bytes(len(response.content))
+            return response
+
+        response = self.session.request(method, url, **kwargs)
+        self._trace_response(response, kwargs.get('stream'))
+        return response
+
+    def _request_http2(self, host: str, method: str, url: str, **kwargs):
+        """httpx로 HTTP/2 요청을 보냅니다.
+
+        호출자는 requests 예외만 처리하므로 httpx 예외를 대응하는 requests 예외로 변환하고,
+        새 커넥션을 연 횟수를 기록하여 HTTP/1.1 경로와 같은 호스트별 재사용 통계를 남깁니다.
+        """
+        def trace(event_name: str, info: Dict):
+            if event_name == 'connection.connect_tcp.complete':
+                with self._lock:
+                    self._http2_counts[host]['connections'] += 1
+
+        with self._lock:
+            self._http2_counts[host]['requests'] += 1
+        try:
+            return self.http2_client.request(method, url, extensions={'trace': trace}, **kwargs)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(str(e)) from e
+        except httpx.ReadTimeout as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            # ConnectError, ReadError, RemoteProtocolError 등 연결 수준 오류
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    @staticmethod
+    def _trace_response(response, stream: bool):
+        """현재 측정 구간에 응답 크기와 urllib3 재시도 횟수를 기록합니다."""
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None:
+            tracing.add_retries(len(retries.history))
+        if not stream:
+            # 스트리밍 응답은 읽는 쪽에서 받은 만큼 기록
+            tracing.add_bytes(len(response.content))
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """호스트별 요청 수, 새로 연 커넥션 수, 재사용 횟수를 반환합니다."""
+        stats = {}
+        with self._lock:
+            for host, count in self._request_counts.items():
+                stats[host] = {'requests': count, 'connections': 0, 'reused': 0}
+
+        # urllib3 커넥션 풀은 생성한 커넥션 수를 기록하므로 이를 이용해 재사용 횟수 계산
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {'requests': 0, 'connections': 0, 'reused': 0})
+            entry['connections'] += pool.num_connections
+            entry['reused'] += max(pool.num_requests - pool.num_connections, 0)
+
+        # HTTP/2 경로는 httpx 커넥션 풀에서 열린 커넥션 수로 계산
+        with self._lock:
+            http2_counts = {host: dict(counts) for host, counts in self._http2_counts.items()}
+        for host, counts in http2_counts.items():
+            entry = stats.setdefault(host, {'requests': 0, 'connections': 0, 'reused': 0})
+            entry['connections'] += counts['connections']
+            entry['reused'] += max(counts['requests'] - counts['connections'], 0)
+
+        return stats
+
+    def log_connection_stats(self):
+        """호스트별 커넥션 재사용 현황을 로그로 남깁니다."""
+        for host, entry in self.get_connection_stats().items():
+            self.logger.info(
+                f"HTTP 커넥션 현황 - {host}: 요청 {entry['requests']}회, "
+                f"신규 연결 {entry['connections']}회, 재사용 {entry['reused']}회"
+            )
+
+    def close(self):
+        """세션과 커넥션 풀을 닫습니다."""
+        self.session.close()
+        if self.http2_client is not None:
+            self.http2_client.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client(config: dict = None) -> HttpClient:
+    """프로세스 전체에서 공유하는 HTTP 클라이언트를 반환합니다."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(config)
+        return _shared_client
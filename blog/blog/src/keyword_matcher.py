@@ -0,0 +1,62 @@
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class KeywordMatcher:
+    """여러 키워드를 텍스트 한 번 훑기로 모두 찾는 Aho-Corasick 자동자입니다.
+
+    키워드 수와 관계없이 텍스트 길이에 비례하는 시간에 모든 출현 위치를 찾으며,
+    겹치거나 다른 키워드에 포함된 키워드(예: '가스'와 '가스관')도 각각 찾습니다.
+    자동자는 생성 시 한 번만 만들고 이후에는 읽기만 하므로 여러 스레드에서 공유할 수 있습니다.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]   # 상태별 다음 글자 → 다음 상태
+        self._fail: List[int] = [0]               # 일치가 끊겼을 때 이동할 상태
+        self._output: List[List[str]] = [[]]      # 상태에 도달하면 끝나는 키워드
+        self.keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword]
+        for keyword in self.keywords:
+            self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build_failure_links(self):
+        """너비 우선으로 실패 링크를 만들고, 접미사로 끝나는 키워드를 출력에 합칩니다."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """텍스트에서 찾은 (시작 위치, 키워드)를 끝나는 위치 순서대로 내보냅니다."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                yield index - len(keyword) + 1, keyword
+
+    def count(self, text: str) -> Counter:
+        """키워드별 출현 횟수를 반환합니다."""
+        return Counter(keyword for _, keyword in self.iter_matches(text))
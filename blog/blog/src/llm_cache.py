@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'data' / 'llm_cache'
+
+
+class LLMResponseCache:
+    """모델, 프롬프트, 파라미터의 해시를 키로 LLM 응답을 디스크에 저장하는 캐시입니다.
+
+    항목은 TTL이 지나면 만료되며, 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은
+    항목부터 삭제합니다(LRU). 사용 시각은 파일 수정 시각으로 기록합니다.
+    """
+
+    def __init__(self, config: dict = None, endpoint: str = ''):
+        self.logger = logging.getLogger(__name__)
+        # 응답을 받은 엔드포인트도 키에 포함하여 로컬 스텁 서버 응답이 운영 호출에 쓰이지 않도록 함
+        self.endpoint = endpoint
+        settings = (config or {}).get('deepseek', {}).get('cache', {})
+        self.enabled = settings.get('enabled', True)
+        # 환경변수로도 캐시를 우회할 수 있음 (예: LLM_CACHE_BYPASS=1)
+        self.bypass = settings.get('bypass', False) or os.getenv('LLM_CACHE_BYPASS') == '1'
+        self.ttl = settings.get('ttl_seconds', 6 * 60 * 60)
+        self.max_bytes = settings.get('max_bytes', 50 * 1024 * 1024)
+
+        cache_dir = Path(settings.get('dir', DEFAULT_CACHE_DIR))
+        self.cache_dir = cache_dir if cache_dir.is_absolute() else PROJECT_ROOT / cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+
+    def make_key(self, payload: Dict) -> str:
+        """엔드포인트와 요청 페이로드(모델, 메시지, 파라미터)의 SHA-256 해시를 반환합니다."""
+        canonical = json.dumps({'endpoint': self.endpoint, 'payload': payload},
+                               sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, payload: Dict) -> Optional[str]:
+        """캐시된 응답을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        if not self.enabled or self.bypass:
+            return None
+
+        path = self._path(self.make_key(payload))
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.stats['misses'] += 1
+                return None
+
+            if time.time() - entry.get('created_at', 0) > self.ttl:
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                path.unlink(missing_ok=True)
+                return None
+
+            # LRU 판단을 위해 사용 시각 갱신
+            os.utime(path)
+            self.stats['hits'] += 1
+            return entry['content']
+
+    def set(self, payload: Dict, content: str):
+        """응답을 캐시에 저장하고 필요하면 오래된 항목을 정리합니다."""
+        if not self.enabled:
+            return
+
+        key = self.make_key(payload)
+        entry = {
+            'created_at': time.time(),
+            'model': payload.get('model'),
+            'content': content
+        }
+        with self._lock:
+            tmp_path = self.cache_dir / f"{key}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+
+    def delete(self, payload: Dict):
+        """캐시된 응답을 삭제합니다 (검증에 실패한 응답 등)."""
+        with self._lock:
+            self._path(self.make_key(payload)).unlink(missing_ok=True)
+
+    def _evict(self):
+        """전체 캐시 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            self.stats['evicted'] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def log_stats(self):
+        """캐시 적중/실패 현황을 로그로 남깁니다."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups else 0
+        self.logger.info(
+            f"LLM 캐시 현황: 적중 {self.stats['hits']}회, 실패 {self.stats['misses']}회 "
+            f"(적중률 {hit_rate:.1f}%), 만료 {self.stats['expired']}회, 삭제 {self.stats['evicted']}회"
+        )
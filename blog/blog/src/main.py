@@ -1,32 +1,68 @@
+import argparse
 import yaml
 import logging
 import os
 from pathlib import Path
-from data_collector import ExchangeRateCollector  # 클래스 이름 변경
-from market_analyzer import ExchangeRateAnalyzer
-from blog_poster import NaverBlogPoster
+from pipeline import get_pipeline
 from datetime import datetime
 import pytz
 from utils import load_environment, setup_logging
-import schedule
-import time
+from scheduler import DeadlineScheduler
+from cassette import apply_cassette_config
+from fixture_server import FixtureServer
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
+# --record/--replay 실행 시 설정에 적용할 카세트 옵션 (mode, directory, fixture_url)
+CASSETTE_OPTIONS = {}
+
 def get_kst_time():
     """현재 한국 시간을 반환합니다."""
     return datetime.now(KST)
 
-def main():
-    """메인 실행 함수"""
-    # 함수 실행 전, 시간 먼저 확인
-    now = get_kst_time()
+def is_weekend_break(now: datetime) -> bool:
+    """주말 휴식 시간(토요일 10:00 ~ 월요일 05:00)인지 확인합니다."""
     weekday = now.weekday() # Monday is 0, Sunday is 6
     hour = now.hour
+    return (weekday == 5 and hour >= 10) or weekday == 6 or (weekday == 0 and hour < 5)
+
+def load_config():
+    """설정 파일을 로드합니다. 파일이 없으면 None을 반환합니다."""
+    current_dir = Path(__file__).parent.parent
+    config_path = current_dir / 'config' / 'config.yaml'
+    
+    if not config_path.exists():
+        print(f"✗ 설정 파일을 찾을 수 없습니다: {config_path}")
+        return None
+        
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    if CASSETTE_OPTIONS:
+        apply_cassette_config(config, **CASSETTE_OPTIONS)
+    return config
+
+def prefetch():
+    """다음 실행에 사용할 데이터를 미리 수집하기 시작합니다."""
+    if is_weekend_break(get_kst_time()):
+        return
+    try:
+        if not load_environment():
+            return
+        config = load_config()
+        if config:
+            setup_logging(config)
+            get_pipeline(config).prefetch()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"데이터 미리 수집 중 오류: {str(e)}", exc_info=True)
 
-    # 주말 실행 제외 로직 (토요일 10:00 ~ 월요일 05:00)
-    if (weekday == 5 and hour >= 10) or weekday == 6 or (weekday == 0 and hour < 5):
+def main(publish_at: datetime = None, force: bool = False):
+    """메인 실행 함수. publish_at이 주어지면 해당 시각에 맞춰 발행합니다."""
+    # 함수 실행 전, 시간 먼저 확인
+    now = get_kst_time()
+
+    # 주말 실행 제외 로직 (토요일 10:00 ~ 월요일 05:00), 직접 실행(force)은 제외
+    if is_weekend_break(now) and not force:
         # 주말 휴식 시간에는 아무것도 하지 않고 조용히 종료
         return
 
@@ -36,92 +72,22 @@ def main():
         print(f"현재 한국 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # 환경 변수 로드
-        if not load_environment():
+        # 재생 실행은 외부 서비스에 접속하지 않으므로 .env 없이도 진행
+        if not load_environment() and CASSETTE_OPTIONS.get('mode') != 'replay':
             print("✗ 환경 변수 설정에 실패했습니다. 프로그램을 종료합니다.")
             return
         
         # 설정 파일 로드
-        current_dir = Path(__file__).parent.parent
-        config_path = current_dir / 'config' / 'config.yaml'
-        
-        if not config_path.exists():
-            print(f"✗ 설정 파일을 찾을 수 없습니다: {config_path}")
+        config = load_config()
+        if not config:
             return
-            
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
         
         # 로깅 설정
         logger = setup_logging(config)
         logger.info("프로그램 초기화 완료")
         
-        # 데이터 수집
-        print("\n1. 환율 데이터 수집 시작...")
-        collector = ExchangeRateCollector(config)
-        exchange_data = collector.get_exchange_rate_data()
-        exchange_news = collector.get_exchange_rate_news()
-        
-        if not exchange_data:
-            print("✗ 오류: 환율 데이터 수집에 실패했습니다.")
-            return
-            
-        if not exchange_news:
-            print("✗ 경고: 뉴스 데이터 수집에 실패했습니다.")
-        
-        # 수집된 데이터 확인
-        print("\n수집된 데이터 요약:")
-        print(f"- 환율: {exchange_data['Close']:.2f}원 (변동: {exchange_data['Change']:+.2f}원, {exchange_data['ChangePercent']:+.2f}%)")
-        print(f"- 네이버 뉴스: {len(exchange_news)}개 기사")
-        
-        # 환율 분석
-        print("\n2. 환율 분석 시작...")
-        analyzer = ExchangeRateAnalyzer(config)
-        analysis = analyzer.analyze_market_trend(exchange_data, exchange_news)
-        
-        # 분석 결과 확인
-        print("\n=== 분석 결과 ===")
-        print(f"\n제목: {analysis.get('title', '제목 생성 실패')}")
-        print("\n본문 미리보기:")
-        content = analysis.get('commentary', '본문 생성 실패')
-        preview = content[:500] + "..." if len(content) > 500 else content
-        print(preview)
-        
-        # 블로그 포스팅
-        print("\n3. 블로그 포스팅 시작...")
-        poster = NaverBlogPoster(config)
-        
-        try:
-            print("- 웹드라이버 설정 중...")
-            if not poster.setup_driver():
-                print("✗ 웹드라이버 설정에 실패했습니다.")
-                return
-                
-            print("- 네이버 로그인 시도 중...")
-            if poster.login():
-                title = analysis['title']
-                content = analysis['commentary']
-                tags = analysis.get('tags', [])
-                
-                print(f"\n포스팅 정보:")
-                print(f"- 제목: {title}")
-                print(f"- 본문 길이: {len(content)}자")
-                
-                print("\n- 블로그 글 작성 및 발행 중...")
-                success = poster.create_post(title, content, tags)
-                if success:
-                    print("✓ 블로그 포스팅 완료!")
-                    logger.info(f"블로그 포스팅 성공: {title}")
-                else:
-                    print("✗ 블로그 포스팅 실패")
-                    logger.error("블로그 포스팅 실패")
-            else:
-                print("✗ 네이버 로그인 실패")
-                logger.error("네이버 로그인 실패")
-        except Exception as e:
-            print(f"✗ 블로그 포스팅 중 오류 발생: {str(e)}")
-            logger.error(f"블로그 포스팅 중 오류: {str(e)}", exc_info=True)
-        finally:
-            poster.close()
+        # 수집 → 분석 → 발행 (브라우저 준비는 수집/분석과 동시에 진행)
+        get_pipeline(config).run(publish_at=publish_at)
         
     except Exception as e:
         print(f"\n✗ 오류 발생: {str(e)}")
@@ -132,21 +98,50 @@ def main():
     
     print("\n=== 프로그램 종료 ===")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="환율 분석 블로그 자동 포스팅")
+    parser.add_argument('--once', action='store_true', help="스케줄러 없이 지금 한 번 실행")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument('--record', metavar='DIR', help="외부 응답을 DIR 카세트에 녹화하며 한 번 실행")
+    cassette.add_argument('--replay', metavar='DIR', help="DIR 카세트와 로컬 픽스처 서버로 네트워크 없이 한 번 실행")
+    return parser.parse_args()
+
+def run_cassette(args):
+    """녹화 또는 재생 모드로 파이프라인을 한 번 실행합니다."""
+    if args.record:
+        CASSETTE_OPTIONS.update(mode='record', directory=args.record)
+        main(force=True)
+        return
+
+    # 재생: 로그인/글쓰기 화면은 로컬 픽스처 서버, 나머지 응답은 카세트에서 제공
+    for name in ('DEEPSEEK_API_KEY', 'NAVER_USERNAME', 'NAVER_PASSWORD'):
+        os.environ.setdefault(name, 'replay')
+    server = FixtureServer().start()
+    CASSETTE_OPTIONS.update(mode='replay', directory=args.replay, fixture_url=server.base_url)
+    try:
+        main(force=True)
+    finally:
+        server.stop()
+
 if __name__ == "__main__":
-    # 한국 시간 기준 3시간 간격으로 실행 (23:59, 02:59, 05:59, 08:59, 11:59, 14:59, 17:59, 20:59)
-    schedule.every().day.at("23:58").do(main)
-    schedule.every().day.at("02:58").do(main)
-    schedule.every().day.at("05:58").do(main)
-    schedule.every().day.at("08:58").do(main)
-    schedule.every().day.at("11:58").do(main)
-    schedule.every().day.at("14:58").do(main)
-    schedule.every().day.at("17:58").do(main)
-    schedule.every().day.at("20:58").do(main)
+    args = parse_args()
+    if args.record or args.replay:
+        run_cassette(args)
+        raise SystemExit(0)
+    if args.once:
+        main(force=True)
+        raise SystemExit(0)
+
+    # 한국 시간 기준 게시 목표 시각(scheduler.post_times)에 맞춰 실행
+    # 시작 시각은 최근 실행의 단계별 p95 소요 시간으로 역산
+    startup_config = load_config() or {}
+    scheduler = DeadlineScheduler(startup_config, run_job=main, prefetch_job=prefetch)
     
-    print(f"스케줄러 설정 완료. 매일 한국 시간 기준 3시간 간격으로 자동 실행됩니다.")
+    print(f"스케줄러 설정 완료. 매일 한국 시간 기준 {', '.join(scheduler.post_times)}에 게시됩니다.")
     print(f"현재 한국 시간: {get_kst_time().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
-    # main()  # 테스트용 직접 실행 주석 처리
\ No newline at end of file
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    # main()  # 테스트용 직접 실행 주석 처리
@@ -1,22 +1,65 @@
 import pandas as pd
 import logging
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
 import os
 import requests
 import json
 from utils import parse_price_string
+from http_client import get_http_client
+from llm_cache import LLMResponseCache
+from tracing import add_bytes, bind, trace_stage
+from tag_engine import get_tag_engine
+from prompt_builder import PromptBuilder
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 import pytz
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
+DEEPSEEK_API_URL = 'https://api.deepseek.com/v1/chat/completions'
+
+# 단일 호출 모드에서 유효한 본문으로 인정할 최소 길이 (자)
+SINGLE_PASS_MIN_COMMENTARY = 300
+
+# 스트리밍이 끝내 완료되지 않았을 때 부분 결과를 사용할 최소 길이 (자)
+STREAM_MIN_PARTIAL = 500
+
+# 논평 이후 단계(제목/태그/포맷팅)를 모두 기다리는 최대 시간 (초)
+DEFAULT_POST_COMMENTARY_DEADLINE = 90
+
+class StreamInterrupted(requests.exceptions.Timeout):
+    """스트리밍 응답이 중간에 끊겼을 때 그때까지 받은 내용을 담아 발생하는 예외입니다."""
+
+    def __init__(self, partial: str, message: str = ''):
+        super().__init__(message or "스트리밍 응답이 중단되었습니다.")
+        self.partial = partial
+
 class ExchangeRateAnalyzer:
     def __init__(self, config: dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.api_key = os.getenv('DEEPSEEK_API_KEY')
+        # DeepSeek 호출 간 TCP/TLS 연결을 재사용하기 위한 공유 클라이언트
+        self.http = get_http_client(config)
+        # 고정 지시문을 재사용하고 호출별 입력 토큰 예산을 지키는 프롬프트 생성기
+        self.prompts = PromptBuilder(config)
+        # chat completions 엔드포인트 (로컬 스텁 서버 등 OpenAI 호환 서버로 바꿀 수 있음)
+        self.api_url = config.get('deepseek', {}).get('api_url') or DEEPSEEK_API_URL
+        # 동일한 엔드포인트/프롬프트의 재호출을 피하기 위한 응답 캐시
+        self.cache = LLMResponseCache(config, endpoint=self.api_url)
+        # 생성 방식: two_pass(초안 + 다듬기 + 제목) 또는 single_pass(JSON 단일 호출)
+        self.generation_mode = config.get('deepseek', {}).get('generation_mode', 'two_pass')
+        # 스트리밍(SSE) 응답 사용 여부 - 타임아웃 시 받은 부분까지 보존
+        self.stream_enabled = config.get('deepseek', {}).get('stream', False)
+        # 논평에만 의존하는 제목 생성/태그 추출/포맷팅을 동시에 실행하기 위한 스레드 풀
+        self.post_commentary_deadline = config.get('deepseek', {}).get(
+            'post_commentary_deadline', DEFAULT_POST_COMMENTARY_DEADLINE)
+        self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='analysis')
+        # 태그 사전으로 본문 태그를 고르는 공유 엔진 (과거 포스팅 TF-IDF 순위, 내용 해시별 결과 캐시)
+        self.tag_engine = get_tag_engine(config)
         
         if not self.api_key:
             raise ValueError("DeepSeek API key not found in environment variables")
@@ -40,8 +83,13 @@ class ExchangeRateAnalyzer:
             self.logger.error(f"시장 분석 중 오류 발생: {e}")
             return None
 
-    def analyze_market_trend(self, market_data: Dict, news: List[Dict]) -> Dict:
-        """시장 데이터와 뉴스를 분석하여 트렌드를 파악합니다."""
+    def analyze_market_trend(self, market_data: Dict, news: List[Dict], market_snapshot: pd.DataFrame = None,
+                             cancel_event: threading.Event = None) -> Dict:
+        """시장 데이터와 뉴스를 분석하여 트렌드를 파악합니다.
+
+        market_snapshot(일괄 수집한 주요 통화/지수 시세)이 있으면 논평 프롬프트에 함께 넣습니다.
+        cancel_event가 설정되면(파이프라인 제한 시간 초과) 남은 API 호출과 재시도를 하지 않고 대체 내용을 반환합니다.
+        """
         try:
             # 데이터 유효성 검사
             if not isinstance(market_data, dict) or not all(key in market_data for key in ['Close', 'Change', 'ChangePercent', 'Date']):
@@ -59,31 +107,31 @@ class ExchangeRateAnalyzer:
             if news:
                 prepared_data['naver_news'] = news
             
+            if market_snapshot is not None and not market_snapshot.empty:
+                prepared_data['market_snapshot'] = [
+                    {'name': row['Name'], 'close': row['Close'], 'change_percent': row['ChangePercent']}
+                    for _, row in market_snapshot.iterrows()
+                ]
+            
+            # 단일 호출 모드: 논평, 제목, 태그를 하나의 JSON 응답으로 생성
+            if self.generation_mode == 'single_pass':
+                print("- 시장 논평/제목/태그 단일 호출 생성 중...")
+                single_pass_result = self._generate_single_pass(prepared_data)
+                if single_pass_result:
+                    print("✓ 단일 호출 생성 완료")
+                    return single_pass_result
+                print("✗ 단일 호출 생성 실패 - 기존 방식으로 진행")
+            
             # 종합적인 시장 논평 생성
             print("- 시장 논평 작성 중...")
-            market_commentary = self._get_deepseek_analysis(self._create_market_commentary_prompt(prepared_data))
-            if not market_commentary or "분석 내용 생성에 실패" in market_commentary:
+            market_commentary = self._get_deepseek_analysis(
+                self._create_market_commentary_prompt(prepared_data), cancel_event=cancel_event)
+            if not market_commentary:
                 return self._create_fallback_content(prepared_data)
             print("✓ 시장 논평 작성 완료")
             
-            # 논평을 바탕으로 제목 생성
-            print("- 제목 생성 중...")
-            title = self._get_deepseek_analysis(self._create_title_from_commentary_prompt(market_commentary))
-            if not title or "분석 내용 생성에 실패" in title:
-                title = self._create_fallback_title(prepared_data)
-            print("✓ 제목 생성 완료")
-            
-            # 태그 생성
-            print("- 태그 생성 중...")
-            tags = self._create_tags_from_content(title, market_commentary)
-            print("✓ 태그 생성 완료")
-            
-            # 분석 결과 구조 통일
-            return {
-                "title": title,
-                "commentary": market_commentary,
-                "tags": tags
-            }
+            # 제목 생성, 태그 추출, 포맷팅은 논평에만 의존하므로 동시에 진행
+            return self._finish_from_commentary(prepared_data, market_commentary, cancel_event)
             
         except Exception as e:
             self.logger.error(f"시장 분석 중 오류 발생: {e}", exc_info=True)
@@ -142,185 +190,315 @@ class ExchangeRateAnalyzer:
 
     def _create_market_commentary_prompt(self, data: Dict) -> str:
         """시장 데이터를 바탕으로 종합적인 논평을 생성하는 프롬프트를 만듭니다."""
-        current_date = datetime.now(KST).strftime('%Y-%m-%d')
-        current_time = datetime.now(KST).strftime('%H:%M')
-        
-        template = f"""다음 원달러 환율 데이터를 바탕으로 {current_date} {current_time} KST 기준 환율 동향을 분석해주세요.
+        return self.prompts.commentary(data)
 
-[환율 정보]
-현재 환율: {data['current_rate']:.2f}원
-전일 대비: {data['daily_change']:+.2f}%
+    def _create_title_from_commentary_prompt(self, analysis: str) -> str:
+        """분석 내용을 바탕으로 제목 생성 프롬프트를 만듭니다 (긴 논평은 예산에 맞게 요약)."""
+        return self.prompts.title(analysis)
 
-[주요 뉴스]"""
+    def _create_single_pass_prompt(self, data: Dict) -> str:
+        """논평 작성, 다듬기, 제목/태그 생성을 한 번에 요청하는 JSON 출력 프롬프트를 만듭니다."""
+        return self.prompts.single_pass(data)
 
-        if 'naver_news' in data and data['naver_news']:
-            template += "\n네이버 금융 뉴스:"
-            for news in data['naver_news']:
-                template += f"\n- {news['title']}"
-                if 'content' in news and news['content']:
-                    template += f"\n  {news['content'][:100]}..."  # 뉴스 본문 일부 포함
-        else:
-            template += "\n- 오늘의 주요 뉴스가 없습니다."
-
-        template += """
-
-작성 요구사항:
-1. 환율 동향 분석 (300자 이상)
-   - 오늘의 원달러 환율 움직임을 상세히 설명
-   - 전일 대비 변동폭과 그 의미를 깊이 있게 분석
-   - 주요 변동 요인을 상세히 설명
-   - 장중 변동폭과 특징적인 움직임 설명
-
-2. 뉴스 기반 분석 (300자 이상)
-   - 주요 뉴스 내용을 상세히 분석
-   - 각 뉴스가 환율에 미친 영향 설명
-   - 시장 참여자들의 반응과 심리 분석
-   - 관련 산업 및 기업에 미치는 영향
-
-3. 실무적 시사점 (300자 이상)
-   - 기업 관점의 시사점 상세 분석
-   - 개인 투자자 관점의 시사점 상세 분석
-   - 단기적 대응 방안 제시
-   - 중장기 전망과 주의점
-
-작성 스타일:
-- 전체 분량: 1,500자 이상
-- 문단별 소제목 포함
-- 전문용어는 반드시 쉽게 풀어서 설명
-- 일반 직장인도 이해하기 쉽게 작성
-- 객관적이고 중립적인 톤 유지
-- 구체적인 수치와 팩트 중심으로 작성
-
-참고사항:
-- 투자 조언이나 확정적 전망은 피할 것
-- 근거 없는 추측성 내용 배제
-- 정확한 수치와 팩트 중심으로 작성
-"""
-        return template
+    def _generate_single_pass(self, data: Dict, timeout=90) -> Dict:
+        """한 번의 JSON 모드 호출로 논평, 제목, 태그를 생성합니다. 실패 시 None을 반환합니다."""
+        try:
+            payload = self._build_payload(
+                self._create_single_pass_prompt(data),
+                max_tokens=3000,
+                response_format={"type": "json_object"}
+            )
+            # 형식이 맞지 않는 응답이 재시도 때마다 재사용되지 않도록 검증을 통과한 응답만 캐시에 저장
+            content = self._chat_completion(payload, timeout, "단일 호출 API 오류", cache_response=False)
+            if content is None:
+                return None
+            
+            result = self._validate_single_pass_result(content)
+            if result is None:
+                self.logger.warning(f"단일 호출 응답이 형식에 맞지 않습니다: {content[:200]}")
+                self.cache.delete(payload)
+            else:
+                self.cache.set(payload, content)
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"단일 호출 생성 중 오류: {e}")
+            return None
 
-    def _create_title_from_commentary_prompt(self, analysis: str) -> str:
-        """분석 내용을 바탕으로 제목 생성 프롬프트를 만듭니다."""
-        current_date = datetime.now(KST).strftime('%m/%d')
-        current_time = datetime.now(KST).strftime('%H:%M')
+    def _validate_single_pass_result(self, content: str) -> Dict:
+        """단일 호출 JSON 응답을 검증하고 분석 결과 형식으로 변환합니다."""
+        try:
+            parsed = json.loads(content)
+        except ValueError:
+            return None
         
-        return f"""다음 환율 분석을 바탕으로 블로그 포스팅 제목을 작성해주세요.
-
-분석 내용: {analysis}
-
-제목 요구사항:
-1. 필수 포함 요소
-   - '[{current_date} {current_time} 환율분석]' 접두어
-   - 날짜와 KST시간 표시 ({current_date} {current_time} KST)
-   - 핵심 환율 동향 또는 주요 영향 요인
-
-2. 작성 스타일
-   - 전체 길이: 30자 내외
-   - 명확하고 간결한 표현
-   - 구체적인 수치나 데이터 포함
-   - 객관적이고 중립적인 톤 유지
-
-3. 제목 예시
-- [{current_date} {current_time} 환율분석] KST 원달러 1,456원, 美 관세 유예에 하락세
-- [{current_date} {current_time} 환율분석]  환율 27.7원↓…수출기업 달러매도 증가
-- [{current_date} {current_time} 환율분석] 원달러 1.85% 급락…美 관세 유예 영향
-
-4. 유의사항
-- 제목 선정이유 반드시 제거하기 (예 : 프롬프트의 내용을 반영했다는 글)
-- 제목은 반드시 하나만 출력하기
-"""
+        if not isinstance(parsed, dict):
+            return None
+        
+        title = parsed.get('title')
+        commentary = parsed.get('commentary')
+        tags = parsed.get('tags', [])
+        
+        if not isinstance(title, str) or not title.strip() or len(title) > 100:
+            return None
+        if not isinstance(commentary, str) or len(commentary.strip()) < SINGLE_PASS_MIN_COMMENTARY:
+            return None
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            return None
+        
+        title = self.prompts.title_with_prefix(title.replace('*', ''))
+        commentary = commentary.replace('*', '').strip()
+        # 모델이 만든 태그가 없으면 기존 방식으로 본문에서 추출 (태그 수는 태그 엔진과 같은 한도 적용)
+        tags = [''.join(c for c in tag if c.isalnum()) for tag in tags]
+        tags = [tag for tag in dict.fromkeys(tags) if len(tag) > 1][:self.tag_engine.limit]
+        if not tags:
+            tags = self._create_tags_from_content(title, commentary)
+        
+        return {
+            "title": title,
+            "commentary": commentary,
+            "tags": tags
+        }
 
     def _format_news_list(self, news: List[Dict]) -> str:
         """뉴스 목록을 포맷팅합니다."""
         return "\n".join([f"- {item['title']}" for item in news])
 
-    def _get_deepseek_analysis(self, prompt: str, max_retries=3, timeout=60) -> str:
-        """DeepSeek API를 호출하여 분석 결과를 얻습니다."""
+    def _build_payload(self, prompt: str, **overrides) -> Dict:
+        """DeepSeek chat completions 요청 페이로드를 만듭니다."""
+        payload = {
+            "model": "deepseek-chat",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 1500
+        }
+        payload.update(overrides)
+        return payload
+
+    def _chat_completion(self, payload: Dict, timeout: int, error_label: str, cache_response: bool = True,
+                         stop_at: str = None) -> str:
+        """DeepSeek API를 호출하여 응답 본문을 반환합니다.
+
+        동일한 페이로드의 응답은 캐시에서 바로 반환합니다. API가 오류 상태 코드를 반환하면
+        None을 반환하고, 타임아웃 등 네트워크 예외는 호출자에게 그대로 전달합니다.
+        cache_response가 False면 응답을 저장하지 않으므로 호출자가 검증 후 직접 저장합니다.
+        스트리밍 모드에서 stop_at이 주어지면 그 문자열이 나오는 즉시 나머지 생성을 기다리지 않고
+        그 앞까지만 반환합니다 (예: 한 줄짜리 제목).
+        """
+        cached = self.cache.get(payload)
+        if cached is not None:
+            print("캐시된 응답 사용")
+            return cached
+
+        if self.stream_enabled:
+            # 토큰이 도착하는 대로 읽음 (중간에 끊기면 StreamInterrupted가 수신된 부분과 함께 전달됨)
+            content = ''
+            tokens = self.stream_completion(payload, timeout, error_label)
+            try:
+                for token in tokens:
+                    content += token
+                    if stop_at and stop_at in content.lstrip():
+                        content = content.lstrip().split(stop_at, 1)[0]
+                        break
+            finally:
+                tokens.close()
+            if not content:
+                return None
+            if cache_response:
+                self.cache.set(payload, content)
+            return content
+
+        response = self.http.post(
+            self.api_url,
+            headers=self._api_headers(),
+            json=payload,
+            timeout=timeout
+        )
+
+        if response.status_code != 200:
+            self.logger.error(f"{error_label}: {response.status_code} - {response.text}")
+            return None
+
+        content = response.json()['choices'][0]['message']['content']
+        if cache_response:
+            self.cache.set(payload, content)
+        return content
+
+    def _api_headers(self) -> Dict:
+        return {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+
+    def _open_stream(self, payload: Dict, timeout: int, error_label: str):
+        """스트리밍(SSE) 요청을 열고 응답 객체를 반환합니다. 오류 상태 코드면 None을 반환합니다."""
+        try:
+            response = self.http.post(
+                self.api_url,
+                headers=self._api_headers(),
+                json=dict(payload, stream=True),
+                timeout=timeout,
+                stream=True
+            )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise StreamInterrupted('', str(e)) from e
+
+        if response.status_code != 200:
+            self.logger.error(f"{error_label}: {response.status_code} - {response.text}")
+            response.close()
+            return None
+        # SSE 응답은 charset이 없어 requests가 ISO-8859-1로 해석하므로 명시
+        response.encoding = 'utf-8'
+        return response
+
+    def stream_completion(self, payload: Dict, timeout: int = 60, error_label: str = "스트리밍 API 오류") -> Iterator[str]:
+        """응답을 토큰이 도착하는 대로 내보냅니다. 별표(*)는 토큰마다 바로 제거합니다.
+
+        호출자는 생성이 끝나기 전에 토큰을 소비하거나 필요한 만큼 읽고 close()로 연결을 닫을 수 있습니다.
+        오류 상태 코드면 아무것도 내보내지 않으며, 중간에 끊기면 StreamInterrupted.partial에
+        그때까지 받은 내용(별표 제거)이 담깁니다.
+        """
+        response = self._open_stream(payload, timeout, error_label)
+        if response is None:
+            return
+        tokens = self._iter_stream_tokens(response)
+        try:
+            for token in tokens:
+                token = token.replace('*', '')
+                if token:
+                    yield token
+        except StreamInterrupted as e:
+            e.partial = e.partial.replace('*', '')
+            raise
+        finally:
+            tokens.close()
+
+    def _iter_stream_tokens(self, response) -> Iterator[str]:
+        """SSE 응답에서 토큰을 순서대로 내보냅니다.
+
+        읽기 시간이 초과되거나 연결이 끊기면 그때까지 받은 내용을 담아 StreamInterrupted를 발생시킵니다.
+        """
+        received = []
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                add_bytes(len(line.encode('utf-8')) if line else 0)
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                delta = json.loads(data)['choices'][0].get('delta', {})
+                token = delta.get('content')
+                if token:
+                    received.append(token)
+                    yield token
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise StreamInterrupted(''.join(received), str(e)) from e
+        finally:
+            response.close()
+
+    def _build_continuation_payload(self, prompt: str, partial: str) -> Dict:
+        """중단된 응답을 이어서 작성하도록 요청하는 페이로드를 만듭니다."""
+        payload = self._build_payload(prompt)
+        payload['messages'] += [
+            {"role": "assistant", "content": partial},
+            {"role": "user", "content": "응답이 중간에 끊겼습니다. 앞의 내용을 반복하지 말고 끊긴 부분부터 이어서 작성해주세요."}
+        ]
+        return payload
+
+    def _analysis_failed(self, reason: str) -> None:
+        """분석 생성 실패를 기록하고 None을 반환합니다 (실패 문구가 본문으로 발행되지 않도록 문자열 대신 None 사용)."""
+        print(f"✗ 시장 분석 생성 실패: {reason}")
+        self.logger.error(f"시장 분석 생성 실패: {reason}")
+        return None
+
+    def _get_deepseek_analysis(self, prompt: str, max_retries=3, timeout=60,
+                               cancel_event: threading.Event = None) -> Optional[str]:
+        """DeepSeek API를 호출하여 분석 결과를 얻습니다. 실패하면 None을 반환합니다.
+
+        cancel_event가 설정되면 다음 호출을 하지 않습니다.
+        """
+        partial_result = ''  # 스트리밍이 끊긴 경우 지금까지 받은 초안
+        # 제목은 한 줄이므로 스트리밍 중 첫 줄이 끝나면 나머지 생성을 기다리지 않음
+        is_title = "제목을 작성해주세요" in prompt
         for attempt in range(max_retries):
+            if cancel_event is not None and cancel_event.is_set():
+                self.logger.warning("분석 단계 제한 시간 초과 - 남은 API 호출을 취소합니다.")
+                return self._analysis_failed("제한 시간을 초과했습니다.")
             try:
-                headers = {
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json'
-                }
-                
-                payload = {
-                    "model": "deepseek-chat",
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 1500
-                }
-                
                 print(f"분석 생성 중... (시도 {attempt+1}/{max_retries})")
-                response = requests.post(
-                    'https://api.deepseek.com/v1/chat/completions',
-                    headers=headers,
-                    json=payload,
-                    timeout=timeout
-                )
+                if partial_result:
+                    # 끊긴 지점부터 이어서 생성
+                    payload = self._build_continuation_payload(prompt, partial_result)
+                else:
+                    payload = self._build_payload(prompt)
+                with trace_stage('analyze.deepseek', attempt=attempt + 1,
+                                 prompt_tokens=self.prompts.counter.count(prompt)) as span:
+                    span.retries = attempt
+                    result = self._chat_completion(payload, timeout, f"API 오류 (시도 {attempt+1})",
+                                                   stop_at='\n' if is_title else None)
+                    if result is None:
+                        span.status = 'failed'
+                if result is not None and partial_result:
+                    result = partial_result + result
                 
-                if response.status_code == 200:
-                    result = response.json()['choices'][0]['message']['content']
+                if result is not None:
                     # 결과에서 별표(*) 제거
                     result = result.replace('*', '')
                     
                     # 제목 생성의 경우 추가 다듬기 없이 바로 반환
-                    if "제목을 작성해주세요" in prompt:
+                    if is_title:
                         return result
                     
-                    # 본문 내용인 경우에만 다듬기 진행
-                    refinement_prompt = f"""다음 내용을 더 자연스럽고 전문적인 블로그 스타일로 다듬어주세요.
-원문: {result}
-
-다듬기 요구사항:
-1. 하루 5번 게시되기에 현재 시황에 집중
-2. 하나의 이슈에 대해서만 깊이있게 줄글로 작성하기
-3. 소비자들에게 불필요한 설명이나 내용, 강조표시를 제거하기 (예 : 프롬프트의 내용을 반영했다는 글)
-4. 전문적이지만 조언 금지
-5. 핵심 내용은 유지하면서 자연스러운 흐름으로 재구성
-6. 별표(*)나 다른 특수문자는 절대 사용하지 않음
-"""
+                    # 제한 시간이 지났으면 다듬기 없이 초안 사용
+                    if cancel_event is not None and cancel_event.is_set():
+                        return result
                     
-                    refinement_payload = {
-                        "model": "deepseek-chat",
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": refinement_prompt
-                            }
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 1500
-                    }
+                    # 본문 내용인 경우에만 다듬기 진행
+                    refinement_prompt = self.prompts.refinement(result)
                     
                     print("결과 다듬기 중...")
-                    refinement_response = requests.post(
-                        'https://api.deepseek.com/v1/chat/completions',
-                        headers=headers,
-                        json=refinement_payload,
-                        timeout=timeout
-                    )
+                    try:
+                        with trace_stage('analyze.deepseek_refine',
+                                         prompt_tokens=self.prompts.counter.count(refinement_prompt)):
+                            refined_result = self._chat_completion(self._build_payload(refinement_prompt), timeout, "다듬기 API 오류")
+                    except StreamInterrupted:
+                        # 초안은 이미 완성되었으므로 다듬기가 끊기면 초안을 사용
+                        self.logger.error("다듬기 스트리밍 중단 - 초안을 사용합니다.")
+                        refined_result = None
                     
-                    if refinement_response.status_code == 200:
-                        refined_result = refinement_response.json()['choices'][0]['message']['content']
+                    if refined_result is not None:
                         # 결과에서 별표(*) 제거
                         refined_result = refined_result.replace('*', '')
                         return refined_result
                     else:
-                        self.logger.error(f"다듬기 API 오류: {refinement_response.status_code} - {refinement_response.text}")
                         return result
                 else:
-                    self.logger.error(f"API 오류 (시도 {attempt+1}): {response.status_code} - {response.text}")
                     if attempt < max_retries - 1:
                         wait_time = 2 ** attempt
                         print(f"재시도 대기 중... ({wait_time}초)")
                         time.sleep(wait_time)
                         continue
                     
-                    return "시장 분석 생성에 실패했습니다. 잠시 후 다시 시도해 주세요."
+                    return self._analysis_failed("API가 오류 응답을 반환했습니다.")
+                    
+            except StreamInterrupted as e:
+                partial_result += e.partial
+                self.logger.error(f"API 스트리밍 중단 (시도 {attempt+1}): {e} - 수신된 {len(partial_result)}자 보존")
+                if attempt < max_retries - 1:
+                    wait_time = 2 ** attempt
+                    print(f"스트리밍 중단, 이어서 생성 재시도 중... ({wait_time}초)")
+                    time.sleep(wait_time)
+                elif len(partial_result) >= STREAM_MIN_PARTIAL:
+                    # 재시도를 모두 실패해도 충분히 받은 부분이 있으면 그대로 사용
+                    return partial_result.replace('*', '')
+                else:
+                    return self._analysis_failed("서버 응답이 지연되고 있습니다.")
                     
             except requests.exceptions.Timeout:
                 self.logger.error(f"API 타임아웃 (시도 {attempt+1})")
@@ -329,7 +507,7 @@ class ExchangeRateAnalyzer:
                     print(f"타임아웃 발생, 재시도 중... ({wait_time}초)")
                     time.sleep(wait_time)
                 else:
-                    return "시장 분석 생성에 실패했습니다. 서버 응답이 지연되고 있습니다."
+                    return self._analysis_failed("서버 응답이 지연되고 있습니다.")
                     
             except Exception as e:
                 self.logger.error(f"API 호출 오류 (시도 {attempt+1}): {e}", exc_info=True)
@@ -338,9 +516,49 @@ class ExchangeRateAnalyzer:
                     print(f"오류 발생, 재시도 중... ({wait_time}초)")
                     time.sleep(wait_time)
                 else:
-                    return "시장 분석 생성에 실패했습니다. 시스템 오류가 발생했습니다."
+                    return self._analysis_failed("시스템 오류가 발생했습니다.")
         
-        return "시장 분석 생성에 실패했습니다. 여러 번 시도했으나 응답을 받지 못했습니다."
+        return self._analysis_failed("여러 번 시도했으나 응답을 받지 못했습니다.")
+
+    def _finish_from_commentary(self, prepared_data: Dict, commentary: str, cancel_event: threading.Event = None) -> Dict:
+        """논평을 바탕으로 제목 생성, 태그 추출, 포맷팅을 동시에 실행하고 공통 제한 시간까지 모읍니다.
+
+        제목이 제한 시간 안에 오지 않거나 실패하면 대체 제목을, 태그 추출이나 포맷팅이
+        실패하면 논평 원문과 빈 태그 목록을 사용합니다. 태그는 제목을 기다리지 않도록
+        논평만으로 추출합니다 (제목은 논평을 요약한 것이므로 키워드가 겹침).
+        """
+        print("- 제목/태그 생성 중...")
+        started = time.monotonic()
+        title_future = self.executor.submit(
+            bind(self._get_deepseek_analysis), self._create_title_from_commentary_prompt(commentary), cancel_event=cancel_event)
+        tags_future = self.executor.submit(bind(self._create_tags_from_content), '', commentary)
+        format_future = self.executor.submit(bind(self.format_blog_content), commentary)
+
+        def join(name: str, future, default):
+            remaining = self.post_commentary_deadline - (time.monotonic() - started)
+            try:
+                return future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                self.logger.warning(f"{name} 생성이 제한 시간({self.post_commentary_deadline}초)을 초과했습니다.")
+            except Exception as e:
+                self.logger.error(f"{name} 생성 중 오류: {e}", exc_info=True)
+            return default
+
+        tags = join('태그', tags_future, [])
+        formatted = join('본문 포맷팅', format_future, commentary)
+        title = join('제목', title_future, None)
+        if not title:
+            title = self._create_fallback_title(prepared_data)
+        else:
+            title = self.prompts.title_with_prefix(title)
+        print(f"✓ 제목/태그 생성 완료 ({time.monotonic() - started:.2f}초)")
+        
+        # 분석 결과 구조 통일
+        return {
+            "title": title,
+            "commentary": formatted,
+            "tags": tags
+        }
 
     def _create_fallback_content(self, data: Dict = None) -> Dict:
         """분석 실패 시 대체 내용을 생성합니다."""
@@ -442,108 +660,15 @@ class ExchangeRateAnalyzer:
             return content  # 에러 발생 시 원본 콘텐츠 반환
 
     def _create_tags_from_content(self, title: str, content: str) -> List[str]:
-        """제목과 본문 내용을 기반으로 태그를 생성합니다."""
+        """제목과 본문 내용을 기반으로 태그를 생성합니다.
+
+        태그 엔진이 후보 용어를 과거 포스팅 IDF 표 기준 TF-IDF 점수순으로 고르고, 부족하면 기본 태그로 채웁니다.
+        태그 수는 blog_settings.tags_limit으로 제한하며, 같은 내용에는 항상 같은 태그를 반환합니다.
+        """
         try:
-            # 기본 태그 세트
-            base_tag_sets = {
-                "주식": ["주식", "주식투자", "주식시장", "주식분석", "주식공부"],
-                "시장": ["시장분석", "시장동향", "시장전망", "시장이슈", "시장리뷰"],
-                "투자": ["투자", "투자전략", "투자분석", "투자이슈", "투자전망"],
-                "경제": ["경제", "경제동향", "경제이슈", "경제전망", "글로벌경제"],
-                "미국": ["미국주식", "미국시장", "미국경제", "나스닥", "S&P500", "다우존스"],
-                "거시경제": ["거시경제", "금리", "인플레이션", "고용", "GDP", "무역", "관세", "정책"],
-                "글로벌": ["글로벌시장", "글로벌경제", "국제무역", "환율", "원자재", "에너지"]
-            }
-            
-            # 섹터/산업 키워드 세트
-            sector_sets = {
-                "테크": ["테크", "기술", "AI", "반도체", "소프트웨어", "하드웨어", "클라우드", "메타버스"],
-                "금융": ["금융", "은행", "증권", "보험", "핀테크", "디지털금융"],
-                "에너지": ["에너지", "석유", "가스", "재생에너지", "태양광", "풍력", "원자력"],
-                "소비재": ["소비재", "유통", "식품", "의류", "화장품", "패션", "소매"],
-                "헬스케어": ["헬스케어", "바이오", "제약", "의료", "건강", "의료기기"],
-                "산업재": ["산업재", "제조", "자동차", "항공", "방위", "기계", "건설"],
-                "유틸리티": ["유틸리티", "전기", "가스", "수도", "인프라"],
-                "부동산": ["부동산", "REITs", "상업용부동산", "주거용부동산"],
-                "통신": ["통신", "텔레콤", "5G", "인터넷", "미디어", "엔터테인먼트"],
-                "재료": ["재료", "화학", "철강", "비철금속", "플라스틱"]
-            }
-            
-            # 기본 태그 선택 (각 세트에서 랜덤하게 1-2개 선택)
-            base_tags = []
-            for tag_set in base_tag_sets.values():
-                import random
-                selected = random.sample(tag_set, min(2, len(tag_set)))
-                base_tags.extend(selected)
-            
-            # 제목에서 키워드 추출 (특수문자 제거)
-            title_keywords = []
-            for word in title.split():
-                # 특수문자 제거
-                clean_word = ''.join(c for c in word if c.isalnum() or c.isspace())
-                if len(clean_word) > 1:
-                    title_keywords.append(clean_word)
-            
-            # 본문에서 주요 키워드 추출 (특수문자 제거)
-            content_keywords = []
-            for line in content.split('\n'):
-                if ':' in line:  # 주요 지표나 종목 정보가 있는 줄
-                    key = line.split(':')[0].strip()
-                    # 특수문자 제거
-                    clean_key = ''.join(c for c in key if c.isalnum() or c.isspace())
-                    if len(clean_key) > 1:
-                        content_keywords.append(clean_key)
-                elif len(line.strip()) > 0:  # 일반 텍스트 줄
-                    words = line.strip().split()
-                    for word in words:
-                        # 특수문자 제거
-                        clean_word = ''.join(c for c in word if c.isalnum() or c.isspace())
-                        if len(clean_word) > 1:
-                            content_keywords.append(clean_word)
-            
-            # 거시경제 키워드 우선 추출
-            macro_keywords = []
-            macro_indicators = ["금리", "인플레이션", "고용", "GDP", "소비자물가", "생산자물가", 
-                              "무역", "관세", "정책", "환율", "원자재", "에너지", "글로벌경제"]
-            for indicator in macro_indicators:
-                if any(indicator in word for word in title_keywords + content_keywords):
-                    macro_keywords.append(indicator)
-            
-            # 종목 심볼 추출 (특수문자 제거)
-            symbols = []
-            for word in title_keywords + content_keywords:
-                if word.isupper() and len(word) <= 5:  # 대문자로 된 5자 이하의 단어는 종목 심볼로 간주
-                    symbols.append(word)
-            
-            # 섹터/산업 키워드 추출 (특수문자 제거)
-            sector_keywords = []
-            for word in title_keywords + content_keywords:
-                for sector, indicators in sector_sets.items():
-                    for indicator in indicators:
-                        if indicator in word:
-                            sector_keywords.append(indicator)
-                            break
-            
-            # 최종 태그 구성 (특수문자 제거)
-            final_tags = []
-            # 거시경제 키워드를 우선적으로 추가
-            final_tags.extend(macro_keywords)
-            # 나머지 태그 추가
-            for tag in (base_tags + symbols + sector_keywords):
-                # 특수문자 제거
-                clean_tag = ''.join(c for c in tag if c.isalnum() or c.isspace())
-                if len(clean_tag) > 1:
-                    final_tags.append(clean_tag)
-            
-            # 중복 제거 및 정렬
-            final_tags = sorted(list(set(final_tags)))
-            
-            # 태그 개수 제한 (최대 15개)
-            return final_tags[:15]
+            return self.tag_engine.content_tags(title, content)
             
         except Exception as e:
             self.logger.error(f"태그 생성 중 오류 발생: {e}")
-            # 오류 발생 시 기본 태그 세트에서 랜덤하게 선택 (특수문자 제거)
-            import random
-            base_tags = ["주식", "시장분석", "투자", "경제", "미국주식", "거시경제", "글로벌경제"]
-            return random.sample(base_tags, 3)
+            # 오류 발생 시 기본 태그 사용
+            return self.tag_engine.fallback_tags[:3]
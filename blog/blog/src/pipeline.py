@@ -0,0 +1,289 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+from data_collector import ExchangeRateCollector
+from driver_manager import get_driver_manager
+from http_client import get_http_client
+from market_analyzer import ExchangeRateAnalyzer
+from publishers import PublishGuard, create_publishers, publish_post
+from stage_history import get_stage_history
+from tracing import bind, get_ledger, trace_stage
+
+# 단계별 기본 설정 (workers: 동시 실행 수, deadline: 제한 시간(초))
+DEFAULT_STAGES = {
+    'collect': {'workers': 1, 'deadline': 60},
+    'analyze': {'workers': 1, 'deadline': 300},
+    'warmup': {'workers': 1, 'deadline': 120},
+    'publish': {'workers': 1, 'deadline': 180}
+}
+
+
+class StageTimeout(Exception):
+    """단계가 제한 시간 안에 끝나지 않았을 때 발생합니다."""
+
+
+class PostingPipeline:
+    """수집 → 분석 → 발행 단계를 단계별 작업 큐로 나누어 겹쳐 실행하는 파이프라인입니다.
+
+    브라우저 준비(로그인)는 수집/분석과 동시에 시작하고, 다음 실행에 쓸 데이터는
+    prefetch()로 미리 수집해 둘 수 있습니다. 각 단계는 자체 스레드 풀(동시 실행 수 제한)과
+    제한 시간을 가집니다.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        # 단계별 측정 구간을 실행마다 JSONL로 남기는 원장 (python tracing.py로 요약)
+        self.ledger = get_ledger(config)
+        settings = config.get('pipeline', {})
+        self.stages = {name: dict(defaults) for name, defaults in DEFAULT_STAGES.items()}
+        for name, overrides in settings.get('stages', {}).items():
+            self.stages.setdefault(name, {}).update(overrides)
+        self.prefetch_max_age = settings.get('prefetch_max_age_minutes', 15) * 60
+
+        self.executors = {
+            name: ThreadPoolExecutor(max_workers=stage['workers'], thread_name_prefix=f"pipeline-{name}")
+            for name, stage in self.stages.items()
+        }
+        self.collector = ExchangeRateCollector(config)
+        self.analyzer = ExchangeRateAnalyzer(config)
+        self.driver_manager = get_driver_manager(config)
+        self.publishers = create_publishers(config, self.driver_manager)
+        # 단계별 소요 시간 기록 (스케줄러가 시작 시각 계산에 사용)
+        self.stage_history = get_stage_history(config)
+
+        self._prefetch_lock = threading.Lock()
+        self._prefetched: Optional[Future] = None
+        self._prefetched_at = None
+
+    def submit(self, stage: str, func, *args) -> Future:
+        """단계의 작업 큐에 작업을 넣습니다. 작업은 현재 실행 ID를 물려받아 단계 구간 안에서 실행됩니다."""
+        return self.executors[stage].submit(bind(self._run_stage), stage, func, *args)
+
+    @staticmethod
+    def _run_stage(stage: str, func, *args):
+        with trace_stage(f'pipeline.{stage}'):
+            return func(*args)
+
+    def wait(self, stage: str, future: Future, started: float = None, cancel_event: threading.Event = None):
+        """단계 작업의 결과를 제한 시간까지 기다립니다.
+
+        제한 시간이 지나면 cancel_event를 설정하여 실행 중인 작업이 남은 외부 호출을 하지 않고
+        빨리 끝나도록 합니다 (이미 실행 중인 스레드는 강제로 멈출 수 없음).
+        """
+        deadline = self.stages[stage]['deadline']
+        elapsed = time.monotonic() - started if started else 0
+        try:
+            return future.result(timeout=max(deadline - elapsed, 0))
+        except FutureTimeoutError:
+            if cancel_event is not None:
+                cancel_event.set()
+            future.cancel()
+            raise StageTimeout(f"{stage} 단계가 제한 시간({deadline}초)을 초과했습니다.")
+
+    def wait_publish(self, future: Future, started: float, guard: PublishGuard) -> Optional[bool]:
+        """발행 결과를 기다립니다.
+
+        제한 시간 안에 발행이 시작되지 않았으면 취소하고 StageTimeout을 발생시키지만, 이미 발행 요청이
+        진행 중이면 실패로 보고한 뒤 글이 올라가는 일이 없도록 결과가 나올 때까지 기다립니다.
+        """
+        deadline = self.stages['publish']['deadline']
+        try:
+            return future.result(timeout=max(deadline - (time.monotonic() - started), 0))
+        except FutureTimeoutError:
+            if guard.cancel():
+                future.cancel()
+                raise StageTimeout(f"publish 단계가 제한 시간({deadline}초)을 초과했습니다.")
+        self.logger.warning(f"발행이 제한 시간({deadline}초)을 넘겼지만 진행 중이므로 결과를 기다립니다.")
+        return future.result()
+
+    def prefetch(self):
+        """다음 실행에 사용할 환율 데이터와 뉴스를 미리 수집하기 시작합니다."""
+        with self._prefetch_lock:
+            self.logger.info("다음 실행용 데이터 미리 수집 시작")
+            self._prefetched = self.submit('collect', self._prefetch_collect)
+            self._prefetched_at = time.monotonic()
+
+    def _prefetch_collect(self) -> Dict:
+        """미리 수집한 구간이 다음 실행 파일에 섞이지 않도록 별도 실행으로 기록하며 수집합니다."""
+        run_id = self.ledger.begin_run('prefetch')
+        self.logger.info(f"미리 수집 실행 ID: {run_id}")
+        started = time.monotonic()
+        try:
+            collected = self._collect()
+            # 실행 시점에는 결과를 꺼내기만 하므로 실제 수집 시간은 여기서 기록
+            self.stage_history.record('collect', time.monotonic() - started)
+            return collected
+        finally:
+            self.ledger.end_run()
+
+    def _take_prefetched(self) -> Optional[Future]:
+        """유효 시간 안에 미리 수집한 결과가 있으면 꺼내 반환합니다."""
+        with self._prefetch_lock:
+            future, fetched_at = self._prefetched, self._prefetched_at
+            self._prefetched = None
+            if future is None or time.monotonic() - fetched_at > self.prefetch_max_age:
+                return None
+            print("- 미리 수집한 데이터 사용")
+            return future
+
+    def _collect(self) -> Dict:
+        """환율 데이터, 뉴스, 주요 통화/지수 시세를 수집합니다."""
+        if self.config.get('data_collection', {}).get('concurrency', {}).get('enabled', False):
+            # 환율 데이터와 뉴스 소스를 동시에 수집 (가장 느린 소스 시간만큼 소요)
+            return self.collector.collect_all()
+        return {
+            'exchange_data': self.collector.get_exchange_rate_data(),
+            'news': self.collector.get_exchange_rate_news(),
+            'market_snapshot': self.collector.get_market_snapshot()
+        }
+
+    def _warm_up(self) -> bool:
+        """발행 전에 로그인된 브라우저를 준비해 둡니다."""
+        return self.driver_manager.warm_up()
+
+    def run(self, publish_at: datetime = None) -> bool:
+        """파이프라인을 한 번 실행하고 발행 성공 여부를 반환합니다.
+
+        publish_at이 주어지면 준비를 마친 뒤 최근 발행 단계 p95 소요 시간만큼 앞선 시각까지
+        기다렸다가 발행하여 글이 목표 시각에 게시되도록 합니다.
+        """
+        started = time.monotonic()
+        run_id = self.ledger.begin_run()
+        self.logger.info(f"실행 ID: {run_id}")
+
+        # 브라우저 준비는 수집/분석과 동시에 진행 (편집기 발행 방식일 때만 필요)
+        warmup_future = None
+        if self.publishers and self.publishers[0].name == 'selenium':
+            warmup_future = self.submit('warmup', self._warm_up)
+
+        try:
+            # 데이터 수집
+            print("\n1. 환율 데이터 수집 시작...")
+            collect_started = time.monotonic()
+            prefetched = self._take_prefetched()
+            collected = self.wait('collect', prefetched or self.submit('collect', self._collect), collect_started)
+            if prefetched is None:
+                # 미리 수집한 데이터는 _prefetch_collect에서 실제 수집 시간을 기록함
+                self.stage_history.record('collect', time.monotonic() - collect_started)
+            exchange_data = collected['exchange_data']
+            exchange_news = collected['news']
+            market_snapshot = collected['market_snapshot']
+
+            if not exchange_data:
+                print("✗ 오류: 환율 데이터 수집에 실패했습니다.")
+                return False
+
+            if not exchange_news:
+                print("✗ 경고: 뉴스 데이터 수집에 실패했습니다.")
+
+            # 수집된 데이터 확인
+            print("\n수집된 데이터 요약:")
+            print(f"- 환율: {exchange_data['Close']:.2f}원 (변동: {exchange_data['Change']:+.2f}원, {exchange_data['ChangePercent']:+.2f}%)")
+            print(f"- 네이버 뉴스: {len(exchange_news)}개 기사")
+            if not market_snapshot.empty:
+                print("- 주요 통화/지수:")
+                for ticker, row in market_snapshot.iterrows():
+                    print(f"  {row['Name']}: {row['Close']:.2f} ({row['ChangePercent']:+.2f}%)")
+
+            # 환율 분석
+            print("\n2. 환율 분석 시작...")
+            analyze_started = time.monotonic()
+            analyze_cancel = threading.Event()
+            analysis = self.wait('analyze', self.submit(
+                'analyze', self.analyzer.analyze_market_trend, exchange_data, exchange_news, market_snapshot, analyze_cancel
+            ), analyze_started, analyze_cancel)
+            self.stage_history.record('analyze', time.monotonic() - analyze_started)
+            self.analyzer.cache.log_stats()
+
+            # 분석 결과 확인
+            print("\n=== 분석 결과 ===")
+            print(f"\n제목: {analysis.get('title', '제목 생성 실패')}")
+            print("\n본문 미리보기:")
+            content = analysis.get('commentary', '본문 생성 실패')
+            preview = content[:500] + "..." if len(content) > 500 else content
+            print(preview)
+
+            # 브라우저 준비 완료 대기 (실패해도 발행 단계에서 다시 시도)
+            if warmup_future is not None:
+                try:
+                    if not self.wait('warmup', warmup_future, started):
+                        self.logger.warning("브라우저 사전 준비 실패 - 발행 단계에서 다시 시도합니다.")
+                except StageTimeout as e:
+                    self.logger.warning(str(e))
+
+            # 블로그 포스팅
+            print("\n3. 블로그 포스팅 시작...")
+            title = analysis['title']
+            content = analysis['commentary']
+            tags = analysis.get('tags', [])
+
+            print(f"\n포스팅 정보:")
+            print(f"- 제목: {title}")
+            print(f"- 본문 길이: {len(content)}자")
+
+            if publish_at is not None:
+                self._hold_until(publish_at)
+
+            print(f"\n- 블로그 글 작성 및 발행 중... ({' → '.join(p.name for p in self.publishers)})")
+            publish_started = time.monotonic()
+            guard = PublishGuard()
+            success = self.wait_publish(self.submit(
+                'publish', publish_post, self.publishers, title, content, tags, guard
+            ), publish_started, guard)
+            if success:
+                self.stage_history.record('publish', time.monotonic() - publish_started)
+                # 다음 IDF 표 생성에 쓰도록 발행한 글을 말뭉치에 추가
+                self.analyzer.tag_engine.ranker.record_post(title, content)
+                print("✓ 블로그 포스팅 완료!")
+                self.logger.info(f"블로그 포스팅 성공: {title}")
+            elif success is None:
+                # 발행 요청이 서버에 도달했을 수 있으므로 실패로 처리하되 다시 발행하지 않음
+                print("✗ 블로그 포스팅 결과 확인 불가 - 블로그에서 발행 여부를 확인하세요.")
+                self.logger.error(f"블로그 포스팅 결과 확인 불가: {title}")
+            else:
+                print("✗ 블로그 포스팅 실패")
+                self.logger.error("블로그 포스팅 실패")
+            return bool(success)
+
+        except StageTimeout as e:
+            print(f"✗ {e}")
+            self.logger.error(str(e))
+            return False
+        finally:
+            self.logger.info(f"파이프라인 실행 시간: {time.monotonic() - started:.2f}초")
+            get_http_client(self.config).log_connection_stats()
+            self.ledger.end_run()
+
+    def _hold_until(self, publish_at: datetime):
+        """발행 단계가 목표 시각에 끝나도록 발행 시작 시각까지 기다립니다."""
+        publish_estimate = self.stage_history.percentile('publish', 95, default=0)
+        start_publish = publish_at - timedelta(seconds=publish_estimate)
+        wait_seconds = (start_publish - datetime.now(publish_at.tzinfo)).total_seconds()
+        if wait_seconds > 0:
+            print(f"- 게시 목표 시각({publish_at.strftime('%H:%M')})에 맞춰 {wait_seconds:.0f}초 대기")
+            time.sleep(wait_seconds)
+        elif wait_seconds < -1:
+            self.logger.warning(f"게시 목표 시각보다 {-wait_seconds:.0f}초 늦게 발행을 시작합니다.")
+
+    def shutdown(self):
+        """모든 단계의 작업 큐를 종료합니다."""
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+
+
+_shared_pipeline: Optional[PostingPipeline] = None
+_shared_lock = threading.Lock()
+
+
+def get_pipeline(config: dict) -> PostingPipeline:
+    """프로세스 전체에서 공유하는 파이프라인을 반환합니다."""
+    global _shared_pipeline
+    with _shared_lock:
+        if _shared_pipeline is None:
+            _shared_pipeline = PostingPipeline(config)
+        return _shared_pipeline
@@ -0,0 +1,310 @@
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import pytz
+
+try:
+    import tiktoken  # 정확한 토큰 수 계산 시에만 필요 (pip install tiktoken)
+except ImportError:
+    tiktoken = None
+
+# 한국 시간대 설정
+KST = pytz.timezone('Asia/Seoul')
+
+# 호출별 입력 토큰 예산 (deepseek.prompt_budgets로 변경 가능)
+DEFAULT_PROMPT_BUDGETS = {
+    'commentary': 1500,
+    'single_pass': 1900,
+    'title': 700,
+}
+
+# 뉴스 한 건에 포함할 본문 길이 (자)
+DEFAULT_NEWS_SNIPPET_CHARS = 100
+
+# 문장 경계 (요약 시 문단의 첫 문장을 자르는 데 사용)
+SENTENCE_END = re.compile(r'(?<=[.!?。])\s+')
+
+# 논평 프롬프트의 고정 지시문 (모듈 로드 시 한 번만 만들어 매 호출 재사용)
+# 프롬프트는 응답 캐시 키가 되므로 분 단위 시각을 넣지 않음 (제목의 시각은 title_with_prefix가 붙임)
+COMMENTARY_HEADER = """다음 원달러 환율 데이터를 바탕으로 {date} KST 기준 환율 동향을 분석해주세요.
+
+[환율 정보]
+현재 환율: {current_rate:.2f}원
+전일 대비: {daily_change:+.2f}%{market_snapshot}
+
+[주요 뉴스]"""
+
+COMMENTARY_INSTRUCTIONS = """
+
+작성 요구사항:
+1. 환율 동향 분석 (300자 이상)
+   - 오늘의 원달러 환율 움직임을 상세히 설명
+   - 전일 대비 변동폭과 그 의미를 깊이 있게 분석
+   - 주요 변동 요인을 상세히 설명
+   - 장중 변동폭과 특징적인 움직임 설명
+
+2. 뉴스 기반 분석 (300자 이상)
+   - 주요 뉴스 내용을 상세히 분석
+   - 각 뉴스가 환율에 미친 영향 설명
+   - 시장 참여자들의 반응과 심리 분석
+   - 관련 산업 및 기업에 미치는 영향
+
+3. 실무적 시사점 (300자 이상)
+   - 기업 관점의 시사점 상세 분석
+   - 개인 투자자 관점의 시사점 상세 분석
+   - 단기적 대응 방안 제시
+   - 중장기 전망과 주의점
+
+작성 스타일:
+- 전체 분량: 1,500자 이상
+- 문단별 소제목 포함
+- 전문용어는 반드시 쉽게 풀어서 설명
+- 일반 직장인도 이해하기 쉽게 작성
+- 객관적이고 중립적인 톤 유지
+- 구체적인 수치와 팩트 중심으로 작성
+
+참고사항:
+- 투자 조언이나 확정적 전망은 피할 것
+- 근거 없는 추측성 내용 배제
+- 정확한 수치와 팩트 중심으로 작성
+"""
+
+NO_NEWS_LINE = "\n- 오늘의 주요 뉴스가 없습니다."
+
+# 일괄 수집한 주요 통화/지수 시세 (있을 때만 환율 정보 뒤에 붙임)
+MARKET_SNAPSHOT_HEADER = "\n\n[주요 통화/지수]"
+
+# 단일 호출 모드에서 논평 프롬프트 뒤에 붙이는 지시문
+SINGLE_PASS_INSTRUCTIONS = """
+문체 요구사항:
+1. 하루 5번 게시되기에 현재 시황에 집중
+2. 하나의 이슈에 대해서만 깊이있게 줄글로 작성하기
+3. 소비자들에게 불필요한 설명이나 내용, 강조표시를 제거하기 (예 : 프롬프트의 내용을 반영했다는 글)
+4. 전문적이지만 조언 금지
+5. 별표(*)나 다른 특수문자는 절대 사용하지 않음
+
+제목 요구사항:
+- '[환율분석]' 접두어로 시작 (날짜와 시각은 발행 시 자동으로 붙음)
+- 전체 길이 30자 내외, 핵심 환율 동향 또는 주요 영향 요인과 구체적인 수치 포함
+- 제목은 반드시 하나만 작성
+
+출력 형식:
+다음 키를 가진 JSON 객체 하나만 출력하세요. JSON 외의 설명은 출력하지 마세요.
+{{
+  "title": "블로그 제목",
+  "commentary": "다듬어진 블로그 본문",
+  "tags": ["태그1", "태그2", "..."]
+}}
+- tags: 본문 내용과 관련된 한국어 키워드 5~15개 (공백과 특수문자 없이)
+"""
+
+# 제목 프롬프트 ('제목을 작성해주세요' 문구로 분석기가 제목 요청을 구분하므로 유지할 것)
+TITLE_HEADER = "다음 환율 분석을 바탕으로 블로그 포스팅 제목을 작성해주세요.\n\n분석 내용: "
+
+# 모델이 출력한 제목 접두어 (예: '[환율분석]', '[10/15 21:07 환율분석]')
+TITLE_PREFIX = re.compile(r'^\[[^\]]*환율분석\]')
+
+TITLE_INSTRUCTIONS = """
+
+제목 요구사항:
+1. 필수 포함 요소
+   - '[환율분석]' 접두어 (날짜와 KST시간은 발행 시 접두어에 자동으로 붙음)
+   - 핵심 환율 동향 또는 주요 영향 요인
+
+2. 작성 스타일
+   - 전체 길이: 30자 내외
+   - 명확하고 간결한 표현
+   - 구체적인 수치나 데이터 포함
+   - 객관적이고 중립적인 톤 유지
+
+3. 제목 예시
+- [환율분석] 원달러 1,456원, 美 관세 유예에 하락세
+- [환율분석] 환율 27.7원↓…수출기업 달러매도 증가
+- [환율분석] 원달러 1.85% 급락…美 관세 유예 영향
+
+4. 유의사항
+- 제목 선정이유 반드시 제거하기 (예 : 프롬프트의 내용을 반영했다는 글)
+- 제목은 반드시 하나만 출력하기
+"""
+
+# 다듬기 프롬프트 (초안 전체를 다듬어야 하므로 예산으로 자르지 않음)
+REFINEMENT_TEMPLATE = """다음 내용을 더 자연스럽고 전문적인 블로그 스타일로 다듬어주세요.
+원문: {draft}
+
+다듬기 요구사항:
+1. 하루 5번 게시되기에 현재 시황에 집중
+2. 하나의 이슈에 대해서만 깊이있게 줄글로 작성하기
+3. 소비자들에게 불필요한 설명이나 내용, 강조표시를 제거하기 (예 : 프롬프트의 내용을 반영했다는 글)
+4. 전문적이지만 조언 금지
+5. 핵심 내용은 유지하면서 자연스러운 흐름으로 재구성
+6. 별표(*)나 다른 특수문자는 절대 사용하지 않음
+"""
+
+
+class TokenCounter:
+    """프롬프트 토큰 수를 계산합니다.
+
+    tiktoken이 설치되어 있으면 cl100k_base 인코딩으로 세고, 없으면 ASCII 4자당 1토큰,
+    한글 등 그 밖의 문자는 1자당 1토큰으로 어림합니다 (예산을 넘지 않도록 넉넉하게 계산).
+    """
+
+    def __init__(self, encoding: str = 'cl100k_base'):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.get_encoding(encoding)
+            except Exception as e:  # 인코딩 파일을 내려받지 못한 경우 등
+                logging.getLogger(__name__).warning(f"tiktoken 인코딩 로드 실패 - 어림 계산 사용: {e}")
+        self.name = f"tiktoken:{encoding}" if self.encoding else 'heuristic'
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        ascii_chars = sum(1 for c in text if c.isascii())
+        return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """텍스트를 max_tokens 이하가 되도록 뒤에서부터 자릅니다."""
+        if max_tokens <= 0:
+            return ''
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        # 어림 계산은 앞부분 길이에 따라 단조 증가하므로 이분 탐색으로 자를 위치를 찾음
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low]
+
+
+class PromptBuilder:
+    """DeepSeek 호출별 프롬프트를 만들고 입력 토큰 예산을 지킵니다.
+
+    고정 지시문은 모듈 상수로 한 번만 만들고 토큰 수도 생성 시 한 번만 계산합니다.
+    예산을 넘으면 논평 프롬프트는 뉴스 본문 발췌 → 뒤쪽 뉴스 순으로 줄이고, 제목 프롬프트는
+    논평을 문단별 첫 문장 위주로 요약한 뒤 필요하면 자릅니다. 호출마다 토큰 수를 로그로 남깁니다.
+    """
+
+    def __init__(self, config: dict):
+        self.logger = logging.getLogger(__name__)
+        settings = config.get('deepseek', {})
+        self.budgets = dict(DEFAULT_PROMPT_BUDGETS)
+        self.budgets.update(settings.get('prompt_budgets', {}))
+        self.news_snippet_chars = settings.get('news_snippet_chars', DEFAULT_NEWS_SNIPPET_CHARS)
+        self.counter = TokenCounter()
+
+        # 날짜 자리는 길이가 고정이므로 예시 값으로 고정 지시문의 토큰 수를 미리 계산
+        sample = {'date': '2000-01-01', 'current_rate': 1000.0, 'daily_change': 0.0, 'market_snapshot': ''}
+        self._static_tokens = {
+            'commentary': self.counter.count(COMMENTARY_HEADER.format(**sample) + COMMENTARY_INSTRUCTIONS),
+            'single_pass': self.counter.count(SINGLE_PASS_INSTRUCTIONS.format()),
+            'title': self.counter.count(TITLE_HEADER + TITLE_INSTRUCTIONS),
+        }
+        self.logger.info(f"프롬프트 토큰 계산: {self.counter.name}, 고정 지시문 {self._static_tokens}")
+
+    def _log(self, kind: str, prompt: str, budget: int = None, trimmed: str = '') -> str:
+        tokens = self.counter.count(prompt)
+        budget_text = f" / 예산 {budget}" if budget else ''
+        trimmed_text = f" ({trimmed})" if trimmed else ''
+        self.logger.info(f"프롬프트 토큰 [{kind}]: {tokens}{budget_text}{trimmed_text}")
+        return prompt
+
+    def _news_lines(self, news: List[Dict], budget: int) -> Tuple[str, str]:
+        """예산 안에 들어가는 뉴스 목록과 줄인 내용 설명을 반환합니다."""
+        if not news:
+            return NO_NEWS_LINE, ''
+
+        def render(items: List[Dict], with_snippet: bool) -> str:
+            lines = "\n네이버 금융 뉴스:"
+            for item in items:
+                lines += f"\n- {item['title']}"
+                if with_snippet and item.get('content'):
+                    lines += f"\n  {item['content'][:self.news_snippet_chars]}..."  # 뉴스 본문 일부 포함
+            return lines
+
+        lines = render(news, True)
+        if self.counter.count(lines) <= budget:
+            return lines, ''
+        # 본문 발췌를 빼고, 그래도 넘으면 뒤쪽 뉴스부터 제외
+        lines = render(news, False)
+        kept = len(news)
+        while kept > 1 and self.counter.count(lines) > budget:
+            kept -= 1
+            lines = render(news[:kept], False)
+        if self.counter.count(lines) > budget:
+            lines = self.counter.truncate(lines, budget)
+        return lines, f"뉴스 발췌 제외, {kept}/{len(news)}건 포함"
+
+    @staticmethod
+    def _snapshot_lines(snapshot: List[Dict]) -> str:
+        """주요 통화/지수 시세 목록을 프롬프트 항목으로 만듭니다."""
+        if not snapshot:
+            return ''
+        lines = MARKET_SNAPSHOT_HEADER
+        for item in snapshot:
+            lines += f"\n- {item['name']}: {item['close']:,.2f} ({item['change_percent']:+.2f}%)"
+        return lines
+
+    def commentary(self, data: Dict, kind: str = 'commentary', reserved: int = 0) -> str:
+        """시장 데이터를 바탕으로 종합적인 논평을 생성하는 프롬프트를 만듭니다."""
+        snapshot = self._snapshot_lines(data.get('market_snapshot'))
+        header = COMMENTARY_HEADER.format(
+            date=datetime.now(KST).strftime('%Y-%m-%d'),
+            current_rate=data['current_rate'], daily_change=data['daily_change'],
+            market_snapshot=snapshot
+        )
+        budget = self.budgets[kind]
+        news_budget = budget - reserved - self._static_tokens['commentary'] - self.counter.count(snapshot)
+        news, trimmed = self._news_lines(data.get('naver_news') or [], news_budget)
+        prompt = header + news + COMMENTARY_INSTRUCTIONS
+        if kind == 'commentary':
+            self._log(kind, prompt, budget, trimmed)
+        return prompt
+
+    def single_pass(self, data: Dict) -> str:
+        """논평 작성, 다듬기, 제목/태그 생성을 한 번에 요청하는 JSON 출력 프롬프트를 만듭니다."""
+        prompt = self.commentary(data, 'single_pass', reserved=self._static_tokens['single_pass'])
+        prompt += SINGLE_PASS_INSTRUCTIONS.format()
+        return self._log('single_pass', prompt, self.budgets['single_pass'])
+
+    def summarize(self, text: str, max_tokens: int) -> Tuple[str, str]:
+        """텍스트가 예산을 넘으면 첫 문단과 이후 문단의 첫 문장으로 요약하고, 그래도 넘으면 자릅니다."""
+        if self.counter.count(text) <= max_tokens:
+            return text, ''
+        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        summary = paragraphs[0] if paragraphs else ''
+        for paragraph in paragraphs[1:]:
+            first_sentence = SENTENCE_END.split(paragraph, 1)[0].strip()
+            candidate = f"{summary}\n{first_sentence}"
+            if self.counter.count(candidate) > max_tokens:
+                break
+            summary = candidate
+        return self.counter.truncate(summary, max_tokens), "논평 요약"
+
+    def title(self, analysis: str) -> str:
+        """분석 내용을 바탕으로 제목 생성 프롬프트를 만듭니다."""
+        budget = self.budgets['title']
+        analysis, trimmed = self.summarize(analysis, budget - self._static_tokens['title'])
+        prompt = TITLE_HEADER + analysis + TITLE_INSTRUCTIONS
+        return self._log('title', prompt, budget, trimmed)
+
+    @staticmethod
+    def title_with_prefix(title: str, now: datetime = None) -> str:
+        """모델이 붙인 접두어를 떼고 현재 KST 날짜/시각 접두어('[MM/DD HH:MM 환율분석]')를 붙입니다.
+
+        프롬프트에는 시각을 넣지 않으므로 캐시된 제목을 다시 사용해도 발행 시각이 맞게 표시됩니다.
+        """
+        now = now or datetime.now(KST)
+        body = TITLE_PREFIX.sub('', title.strip(), count=1).strip()
+        return f"[{now.strftime('%m/%d %H:%M')} 환율분석] {body}"
+
+    def refinement(self, draft: str) -> str:
+        """초안을 블로그 문체로 다듬는 프롬프트를 만듭니다."""
+        return self._log('refine', REFINEMENT_TEMPLATE.format(draft=draft))
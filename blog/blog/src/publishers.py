@@ -0,0 +1,323 @@
+import json
+import logging
+import pickle
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from pathlib import Path
+
+from blog_poster import COOKIES_FILE
+from http_client import get_http_client
+
+# SmartEditor ONE이 글 저장/발행에 사용하는 엔드포인트 (공개 API가 아니므로 설정으로 변경 가능)
+DEFAULT_WRITE_ENDPOINT = 'https://blog.naver.com/RabbitWrite.naver'
+
+# HTTP 발행 요청 결과 상태
+POST_OK = 'ok'
+POST_FAILED = 'failed'                  # 서버가 발행을 거부했거나 요청이 전송되지 않음
+POST_AUTH_REQUIRED = 'auth_required'    # 로그인 쿠키 만료
+POST_UNKNOWN = 'unknown'                # 서버에서 발행되었는지 알 수 없음
+
+
+class PublishOutcomeUnknown(Exception):
+    """발행 요청이 서버에 도달했는지 알 수 없을 때 발생합니다 (재시도/대체 발행 금지)."""
+
+
+class PublishGuard:
+    """발행 단계 제한 시간 처리를 위한 상태입니다.
+
+    발행을 시작하기 전에는 취소할 수 있지만, 발행 방식이 한 번 시작된 뒤에는 글이 올라가는
+    중일 수 있으므로 취소할 수 없습니다 (파이프라인은 결과가 나올 때까지 기다립니다).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cancelled = False
+        self.in_flight = False
+
+    def begin(self) -> bool:
+        """발행을 시작합니다. 이미 취소되었으면 False를 반환합니다."""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.in_flight = True
+            return True
+
+    def cancel(self) -> bool:
+        """아직 발행을 시작하지 않았으면 취소하고 True를 반환합니다."""
+        with self._lock:
+            if self.in_flight:
+                return False
+            self.cancelled = True
+            return True
+
+
+class BlogPublisher(ABC):
+    """블로그 글 발행 방식의 공통 인터페이스입니다."""
+
+    name = 'base'
+
+    @abstractmethod
+    def publish(self, title: str, content: str, tags: List[str] = None) -> bool:
+        """글을 발행하고 성공 여부를 반환합니다."""
+
+
+class SeleniumPublisher(BlogPublisher):
+    """로그인된 브라우저로 글쓰기 편집기를 조작하여 발행합니다."""
+
+    name = 'selenium'
+
+    def __init__(self, config: dict, driver_manager):
+        self.config = config
+        self.driver_manager = driver_manager
+        self.logger = logging.getLogger(__name__)
+
+    def publish(self, title: str, content: str, tags: List[str] = None) -> bool:
+        failed = True
+        try:
+            print("- 로그인된 브라우저 준비 중...")
+            poster = self.driver_manager.acquire()
+            if poster is None:
+                self.logger.error("브라우저 준비 또는 네이버 로그인 실패")
+                return False
+
+            success = poster.create_post(title, content, tags)
+            failed = not success
+            return success
+        finally:
+            # 성공한 브라우저는 다음 실행을 위해 유지, 실패한 브라우저는 종료
+            self.driver_manager.release(failed=failed)
+
+
+class NaverHttpPublisher(BlogPublisher):
+    """브라우저 로그인으로 얻은 세션 쿠키로 글쓰기 엔드포인트에 직접 발행합니다.
+
+    쿠키는 저장된 쿠키 파일을 먼저 사용하고, 만료되었으면 브라우저로 다시 로그인하여
+    새 쿠키를 받습니다. 브라우저는 인증에만 사용됩니다.
+    """
+
+    name = 'http'
+
+    def __init__(self, config: dict, driver_manager):
+        self.config = config
+        self.driver_manager = driver_manager
+        self.logger = logging.getLogger(__name__)
+        blog_config = config.get('blog', {})
+        self.blog_id = blog_config.get('url', 'https://blog.naver.com/gongnyangi').rstrip('/').split('/')[-1]
+        self.category_no = blog_config.get('category_no', 15)
+        self.endpoint = blog_config.get('write_endpoint', DEFAULT_WRITE_ENDPOINT)
+        self.timeout = blog_config.get('http_publish_timeout', 15)
+        self.cookies_file = Path(config.get('browser', {}).get('cookies_file') or COOKIES_FILE)
+
+        # 쿠키는 발행 세션에만 두고, 커넥션 풀은 공유 클라이언트의 것을 사용
+        self.session = requests.Session()
+        adapter = get_http_client(config).adapter
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36',
+            'Referer': f'https://blog.naver.com/{self.blog_id}/postwrite'
+        })
+
+    def publish(self, title: str, content: str, tags: List[str] = None) -> bool:
+        started = time.monotonic()
+        if not self.session.cookies and not self._load_saved_cookies():
+            if not self._refresh_cookies():
+                return False
+
+        status, result = self._post(title, content, tags or [])
+        if status == POST_AUTH_REQUIRED:
+            # 로그인이 풀렸다는 응답이 명확할 때만 쿠키를 갱신하여 한 번 더 시도
+            self.logger.info("로그인 쿠키가 만료되었습니다 - 쿠키를 갱신하여 재시도합니다.")
+            if not self._refresh_cookies():
+                return False
+            status, result = self._post(title, content, tags or [])
+
+        if status == POST_UNKNOWN:
+            # 요청이 서버에 도달했을 수 있으므로 재시도하면 글이 중복 발행될 수 있음
+            raise PublishOutcomeUnknown("HTTP 발행 결과를 확인할 수 없습니다 - 블로그에서 발행 여부를 확인하세요.")
+        if status != POST_OK:
+            return False
+
+        self.logger.info(f"HTTP 발행 완료 ({time.monotonic() - started:.2f}초): {result.get('redirectUrl', '')}")
+        return True
+
+    def _post(self, title: str, content: str, tags: List[str]) -> Tuple[str, Optional[Dict]]:
+        """글쓰기 엔드포인트에 발행 요청을 보내고 (결과 상태, 응답 result)를 반환합니다.
+
+        발행 요청은 멱등하지 않으므로, 요청이 서버에 도달했는지 알 수 없는 경우(응답 대기 시간 초과,
+        연결 끊김, 해석할 수 없는 응답)는 실패가 아닌 POST_UNKNOWN으로 구분합니다.
+        """
+        data = {
+            'blogId': self.blog_id,
+            'documentModel': json.dumps(self._build_document_model(title, content), ensure_ascii=False),
+            'populationParams': json.dumps(self._build_population_params(tags), ensure_ascii=False),
+            'productApiVersion': 'v1'
+        }
+        try:
+            response = self.session.post(self.endpoint, data=data, timeout=self.timeout)
+        except requests.exceptions.ConnectTimeout as e:
+            # 연결 자체가 안 된 경우는 요청이 전송되지 않았음
+            self.logger.error(f"HTTP 발행 연결 실패: {e}")
+            return POST_FAILED, None
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"HTTP 발행 요청 오류 (발행 여부 불명): {e}")
+            return POST_UNKNOWN, None
+
+        if response.status_code in (401, 403) or self._is_login_page(response):
+            self.logger.error(f"HTTP 발행 인증 실패: {response.status_code}")
+            return POST_AUTH_REQUIRED, None
+
+        try:
+            body = response.json()
+        except ValueError:
+            self.logger.error(f"HTTP 발행 응답 형식 오류 (발행 여부 불명): {response.status_code}")
+            return POST_UNKNOWN, None
+
+        if response.status_code != 200 or not isinstance(body, dict) or not body.get('isSuccess'):
+            self.logger.error(f"HTTP 발행 실패: {response.status_code} - {str(body)[:200]}")
+            return POST_FAILED, None
+        return POST_OK, body.get('result', {})
+
+    @staticmethod
+    def _is_login_page(response) -> bool:
+        """로그인이 풀리면 JSON 대신 로그인 페이지(또는 로그인 페이지로의 이동)가 반환됩니다."""
+        urls = [response.url] + [r.headers.get('Location', '') for r in response.history]
+        if any('nidlogin' in (url or '') for url in urls):
+            return True
+        content_type = response.headers.get('Content-Type', '')
+        return 'html' in content_type and 'nidlogin' in response.text
+
+    @staticmethod
+    def _new_id() -> str:
+        return f"SE-{uuid.uuid4()}"
+
+    def _paragraph(self, text: str) -> Dict:
+        return {
+            'id': self._new_id(),
+            'nodes': [{'id': self._new_id(), 'value': text, '@ctype': 'textNode'}],
+            '@ctype': 'paragraph'
+        }
+
+    def _build_document_model(self, title: str, content: str) -> Dict:
+        """제목 컴포넌트와 본문 텍스트 컴포넌트로 구성된 SmartEditor 문서 모델을 만듭니다."""
+        paragraphs = [self._paragraph(line) for line in content.strip().split('\n')]
+        return {
+            'documentId': '',
+            'document': {
+                'version': '2.8.0',
+                'theme': 'default',
+                'language': 'ko-KR',
+                'id': str(uuid.uuid4()),
+                'components': [
+                    {
+                        'id': self._new_id(),
+                        'layout': 'default',
+                        'title': [self._paragraph(title)],
+                        'subTitle': None,
+                        'align': 'left',
+                        '@ctype': 'documentTitle'
+                    },
+                    {
+                        'id': self._new_id(),
+                        'layout': 'default',
+                        'value': paragraphs,
+                        '@ctype': 'text'
+                    }
+                ]
+            }
+        }
+
+    def _build_population_params(self, tags: List[str]) -> Dict:
+        """공개 설정, 카테고리, 태그 등 발행 옵션을 만듭니다."""
+        return {
+            'configuration': {
+                'openType': 2,          # 전체 공개
+                'commentYn': True,
+                'searchYn': True,
+                'sympathyYn': True,
+                'scrapType': 2,
+                'outSideAllowYn': True
+            },
+            'populationMeta': {
+                'categoryId': self.category_no,
+                'logNo': None,
+                'directorySeq': 0,
+                'postWriteTimeType': 'now',
+                'tags': ','.join(tags),
+                'noticePostYn': False
+            }
+        }
+
+    def _set_cookies(self, cookies: List[Dict]):
+        self.session.cookies.clear()
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+    def _load_saved_cookies(self) -> bool:
+        """브라우저 로그인 때 저장된 쿠키 파일을 불러옵니다."""
+        if not self.cookies_file.exists():
+            return False
+        try:
+            with open(self.cookies_file, 'rb') as f:
+                self._set_cookies(pickle.load(f))
+            return True
+        except Exception as e:
+            self.logger.warning(f"저장된 쿠키를 불러오지 못했습니다: {e}")
+            return False
+
+    def _refresh_cookies(self) -> bool:
+        """브라우저로 로그인하여 새 쿠키를 받아옵니다."""
+        poster = self.driver_manager.acquire()
+        if poster is None:
+            self.logger.error("쿠키 갱신을 위한 브라우저 로그인 실패")
+            return False
+        try:
+            self._set_cookies(poster.driver.get_cookies())
+            return True
+        finally:
+            self.driver_manager.release()
+
+
+def create_publishers(config: dict, driver_manager) -> List[BlogPublisher]:
+    """설정된 발행 방식과 대체 방식을 우선순위대로 반환합니다."""
+    available = {
+        SeleniumPublisher.name: SeleniumPublisher,
+        NaverHttpPublisher.name: NaverHttpPublisher
+    }
+    blog_config = config.get('blog', {})
+    names = [blog_config.get('publisher', SeleniumPublisher.name)]
+    fallback = blog_config.get('fallback_publisher')
+    if fallback and fallback not in names:
+        names.append(fallback)
+    return [available[name](config, driver_manager) for name in names if name in available]
+
+
+def publish_post(publishers: List[BlogPublisher], title: str, content: str,
+                 tags: List[str] = None, guard: PublishGuard = None) -> Optional[bool]:
+    """발행 방식을 순서대로 시도하여 하나라도 성공하면 True를 반환합니다.
+
+    발행 여부를 알 수 없는 결과가 나오면 중복 발행을 막기 위해 다음 방식으로 넘어가지 않고 None을 반환합니다.
+    guard가 이미 취소되었으면(제한 시간 초과) 아무것도 발행하지 않고 False를 반환합니다.
+    """
+    logger = logging.getLogger(__name__)
+    if guard is not None and not guard.begin():
+        logger.warning("발행 단계가 시작 전에 취소되었습니다 - 발행하지 않습니다.")
+        return False
+    for publisher in publishers:
+        try:
+            if publisher.publish(title, content, tags):
+                return True
+        except PublishOutcomeUnknown as e:
+            logger.error(f"{publisher.name} {e}")
+            return None
+        except Exception as e:
+            logger.error(f"{publisher.name} 발행 중 오류: {e}", exc_info=True)
+        logger.warning(f"{publisher.name} 발행 실패")
+    return False
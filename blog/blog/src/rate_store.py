@@ -0,0 +1,97 @@
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 저장되는 봉 데이터 구조 (타임스탬프는 UTC 기준 나노초)
+BAR_DTYPE = np.dtype([
+    ('timestamp', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8')
+])
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_STORE_DIR = PROJECT_ROOT / 'data' / 'rates'
+
+
+class RateHistoryStore:
+    """티커별 시세 봉 데이터를 메모리 맵 NumPy 파일(.npy)로 보관하는 저장소입니다."""
+
+    def __init__(self, ticker: str, store_dir: Optional[Path] = None):
+        self.ticker = ticker
+        self.logger = logging.getLogger(__name__)
+        self.store_dir = Path(store_dir) if store_dir else DEFAULT_STORE_DIR
+        if not self.store_dir.is_absolute():
+            self.store_dir = PROJECT_ROOT / self.store_dir
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        # 티커의 특수문자(=, ^ 등)를 파일명에 안전한 문자로 변환
+        safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', ticker)
+        self.path = self.store_dir / f"{safe_name}.npy"
+        self._lock = threading.Lock()
+
+    def load(self) -> np.ndarray:
+        """저장된 봉 데이터를 읽기 전용 메모리 맵으로 불러옵니다."""
+        if not self.path.exists():
+            return np.empty(0, dtype=BAR_DTYPE)
+        try:
+            return np.load(self.path, mmap_mode='r')
+        except (ValueError, OSError) as e:
+            self.logger.error(f"시세 저장소 읽기 실패 ({self.path}): {e}")
+            return np.empty(0, dtype=BAR_DTYPE)
+
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """마지막으로 저장된 봉의 시각을 반환합니다."""
+        bars = self.load()
+        if len(bars) == 0:
+            return None
+        return pd.Timestamp(int(bars['timestamp'][-1]), unit='ns', tz='UTC')
+
+    def append(self, hist: pd.DataFrame) -> int:
+        """yfinance history 결과를 저장소에 병합합니다. 같은 시각의 봉은 새 값으로 덮어씁니다."""
+        if hist is None or hist.empty:
+            return 0
+
+        index = hist.index
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        new_bars = np.empty(len(hist), dtype=BAR_DTYPE)
+        new_bars['timestamp'] = index.tz_convert('UTC').as_unit('ns').asi8
+        for column in ('open', 'high', 'low', 'close', 'volume'):
+            source = column.capitalize()
+            new_bars[column] = hist[source].to_numpy(dtype='f8') if source in hist else np.nan
+
+        with self._lock:
+            existing = np.array(self.load())  # 메모리 맵을 복사하여 파일 잠금 해제
+            merged = np.concatenate([new_bars, existing])
+            # 새로 받은 봉을 우선하도록 앞쪽 항목을 남기고 중복 제거 (결과는 시각순 정렬)
+            _, unique_idx = np.unique(merged['timestamp'], return_index=True)
+            merged = merged[unique_idx]
+
+            # 임시 파일에 쓴 후 교체하여 쓰기 도중 중단되어도 기존 데이터 보존
+            tmp_path = self.path.with_name(self.path.stem + '.tmp.npy')
+            np.save(tmp_path, merged)
+            os.replace(tmp_path, self.path)
+
+        added = len(merged) - len(existing)
+        self.logger.info(f"{self.ticker} 시세 저장: 신규 {added}개 봉 (총 {len(merged)}개)")
+        return added
+
+    def to_frame(self) -> pd.DataFrame:
+        """저장된 전체 봉 데이터를 DataFrame으로 반환합니다."""
+        bars = self.load()
+        frame = pd.DataFrame({
+            'Open': bars['open'],
+            'High': bars['high'],
+            'Low': bars['low'],
+            'Close': bars['close'],
+            'Volume': bars['volume']
+        }, index=pd.to_datetime(bars['timestamp'], unit='ns', utc=True))
+        return frame
@@ -0,0 +1,102 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+import pytz
+
+from stage_history import get_stage_history
+
+# 한국 시간대 설정
+KST = pytz.timezone('Asia/Seoul')
+
+# 목표 시각 전에 발행을 마치기 위해 포함하는 단계 (warmup은 수집/분석과 동시에 진행되므로 제외)
+CRITICAL_PATH_STAGES = ['collect', 'analyze', 'publish']
+
+
+class DeadlineScheduler:
+    """KST 게시 목표 시각에 글이 발행되도록 파이프라인 시작 시각을 역산하는 스케줄러입니다.
+
+    폴링 없이 다음 이벤트 시각까지 정확히 대기하며, 시작 시각은 최근 실행에서 측정한
+    단계별 p95 소요 시간의 합에 여유 시간을 더해 목표 시각에서 뺀 값입니다.
+    """
+
+    def __init__(self, config: dict, run_job: Callable[[datetime], None],
+                 prefetch_job: Optional[Callable[[], None]] = None):
+        self.logger = logging.getLogger(__name__)
+        settings = config.get('scheduler', {})
+        self.post_times = settings.get('post_times') or list(config.get('blog', {}).get('post_time', {}).values())
+        self.safety_margin = settings.get('safety_margin_seconds', 30)
+        self.default_stage_seconds = settings.get('default_stage_seconds', {
+            'collect': 20, 'analyze': 90, 'publish': 30
+        })
+        self.prefetch_lead = config.get('pipeline', {}).get('prefetch_lead_minutes', 5) * 60
+        self.history = get_stage_history(config)
+        self.run_job = run_job
+        self.prefetch_job = prefetch_job
+        self._stop = threading.Event()
+        self._last_target: Optional[datetime] = None
+
+        if not self.post_times:
+            raise ValueError("scheduler.post_times 또는 blog.post_time에 게시 시각이 설정되지 않았습니다.")
+
+    def stage_estimate(self, stage: str) -> float:
+        """단계의 예상 소요 시간(최근 p95, 기록이 없으면 기본값)을 반환합니다."""
+        return self.history.percentile(stage, 95, default=self.default_stage_seconds.get(stage, 0))
+
+    def lead_time(self) -> timedelta:
+        """목표 시각보다 얼마나 먼저 파이프라인을 시작해야 하는지 계산합니다."""
+        seconds = sum(self.stage_estimate(stage) for stage in CRITICAL_PATH_STAGES)
+        return timedelta(seconds=seconds + self.safety_margin)
+
+    def upcoming_targets(self, now: datetime) -> List[datetime]:
+        """지금 이후의 게시 목표 시각을 오늘과 내일 기준으로 정렬하여 반환합니다."""
+        targets = []
+        for day_offset in (0, 1):
+            day = (now + timedelta(days=day_offset)).date()
+            for post_time in self.post_times:
+                hour, minute = map(int, post_time.split(':'))
+                target = KST.localize(datetime(day.year, day.month, day.day, hour, minute))
+                if target > now:
+                    targets.append(target)
+        return sorted(targets)
+
+    def sleep_until(self, when: datetime) -> bool:
+        """지정한 시각까지 대기합니다. 중지 요청이 오면 False를 반환합니다.
+
+        시스템 시계 변경에 대응하도록 최대 1분마다 남은 시간을 다시 계산합니다.
+        """
+        while not self._stop.is_set():
+            remaining = (when - datetime.now(KST)).total_seconds()
+            if remaining <= 0:
+                return True
+            self._stop.wait(min(remaining, 60))
+        return False
+
+    def run_forever(self):
+        """중지될 때까지 다음 게시 시각에 맞춰 데이터 사전 수집과 파이프라인을 실행합니다."""
+        while not self._stop.is_set():
+            now = datetime.now(KST)
+            # 목표 시각 전에 발행이 끝난 경우 같은 목표를 다시 실행하지 않음
+            target = next(t for t in self.upcoming_targets(now)
+                          if self._last_target is None or t > self._last_target)
+            lead = self.lead_time()
+            start_at = target - lead
+            self.logger.info(
+                f"다음 게시 목표: {target.strftime('%Y-%m-%d %H:%M')} KST, "
+                f"시작 예정: {start_at.strftime('%H:%M:%S')} (예상 소요 {lead.total_seconds():.0f}초)"
+            )
+
+            prefetch_at = start_at - timedelta(seconds=self.prefetch_lead)
+            if self.prefetch_job and self.prefetch_lead and prefetch_at > now:
+                if not self.sleep_until(prefetch_at):
+                    break
+                self.prefetch_job()
+
+            if not self.sleep_until(start_at):
+                break
+            self._last_target = target
+            self.run_job(target)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,75 @@
+import json
+import logging
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from tracing import percentile
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_HISTORY_FILE = PROJECT_ROOT / 'logs' / 'stage_durations.jsonl'
+
+
+class StageHistory:
+    """파이프라인 단계별 소요 시간을 기록하고 최근 실행 기준 백분위 값을 계산합니다."""
+
+    def __init__(self, config: dict = None):
+        self.logger = logging.getLogger(__name__)
+        settings = (config or {}).get('scheduler', {})
+        history_file = Path(settings.get('history_file', DEFAULT_HISTORY_FILE))
+        self.path = history_file if history_file.is_absolute() else PROJECT_ROOT / history_file
+        self.window = settings.get('history_window', 50)  # 단계별로 사용할 최근 기록 수
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._load()
+
+    def _load(self):
+        """기록 파일에서 최근 소요 시간을 불러옵니다."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._samples[record['stage']].append(float(record['duration']))
+                    except (ValueError, KeyError):
+                        continue
+        except OSError as e:
+            self.logger.warning(f"단계 소요 시간 기록을 읽지 못했습니다: {e}")
+
+    def record(self, stage: str, duration: float):
+        """단계 소요 시간을 추가합니다."""
+        with self._lock:
+            self._samples[stage].append(duration)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        'time': datetime.now().isoformat(timespec='seconds'),
+                        'stage': stage,
+                        'duration': round(duration, 3)
+                    }) + '\n')
+            except OSError as e:
+                self.logger.warning(f"단계 소요 시간 기록 실패: {e}")
+
+    def percentile(self, stage: str, pct: float = 95, default: float = None) -> float:
+        """단계의 최근 소요 시간 백분위 값(nearest-rank)을 반환합니다. 기록이 없으면 default."""
+        with self._lock:
+            value = percentile(list(self._samples.get(stage, ())), pct)
+        return default if value is None else value
+
+
+_shared_history: Optional[StageHistory] = None
+_shared_lock = threading.Lock()
+
+
+def get_stage_history(config: dict) -> StageHistory:
+    """프로세스 전체에서 공유하는 단계 소요 시간 기록을 반환합니다."""
+    global _shared_history
+    with _shared_lock:
+        if _shared_history is None:
+            _shared_history = StageHistory(config)
+        return _shared_history
@@ -0,0 +1,130 @@
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from keyword_matcher import KeywordMatcher
+from tag_ranker import TagRanker
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_DICTIONARY_FILE = PROJECT_ROOT / 'config' / 'tag_dictionary.yaml'
+
+# blog_settings.tags_limit이 없을 때 사용할 태그 최대 개수
+DEFAULT_TAGS_LIMIT = 10
+
+
+def clean_tag(tag: str) -> str:
+    """태그에서 특수문자를 제거합니다."""
+    return ''.join(c for c in tag if c.isalnum() or c.isspace())
+
+
+def _flatten(groups: Dict[str, List[str]]) -> List[str]:
+    return list(dict.fromkeys(tag for tags in groups.values() for tag in tags))
+
+
+class TagEngine:
+    """태그 사전 파일을 한 번 읽어 만든 키워드 자동자로 본문 태그와 시장 브리핑 태그를 생성합니다.
+
+    본문 한 번 훑기로 모든 사전 키워드의 출현 횟수를 구하고, 본문 태그는 TagRanker의 TF-IDF 점수순,
+    시장 브리핑 태그는 시장 상황/자산군 신호가 강한 순으로 고릅니다. 태그 수는 플랫폼 설정
+    (blog_settings.tags_limit)으로 제한합니다.
+    """
+
+    def __init__(self, config: dict):
+        self.logger = logging.getLogger(__name__)
+        settings = config.get('tags', {})
+        path = Path(settings.get('dictionary_file') or DEFAULT_DICTIONARY_FILE)
+        self.dictionary_file = path if path.is_absolute() else PROJECT_ROOT / path
+        with open(self.dictionary_file, 'r', encoding='utf-8') as f:
+            dictionary = yaml.safe_load(f) or {}
+
+        self.limit = config.get('blog_settings', {}).get('tags_limit', DEFAULT_TAGS_LIMIT)
+
+        base_sets = dictionary.get('base_sets', {})
+        self.content_keywords = list(dict.fromkeys(
+            dictionary.get('macro_indicators', []) + _flatten(dictionary.get('sectors', {})) + _flatten(base_sets)
+        ))
+        # 후보 태그가 부족할 때 순서대로 채우는 기본 태그 (각 세트의 앞 두 개)
+        self.fallback_tags = list(dict.fromkeys(clean_tag(tag) for tags in base_sets.values() for tag in tags[:2]))
+
+        self.market_conditions = dictionary.get('market_conditions', {})
+        self.asset_classes = dictionary.get('asset_classes', {})
+        self.market_base_tags = dictionary.get('market_base_tags', [])
+        self.date_formats = dictionary.get('date_formats', [])
+        self.briefing_tags = dictionary.get('briefing_tags', [])
+
+        # 본문 후보 키워드와 시장 상황/자산군 신호를 모두 한 자동자로 찾음
+        signal_keywords = [t for c in self.market_conditions.values() for t in c.get('triggers', [])]
+        signal_keywords += list(self.asset_classes)
+        self.matcher = KeywordMatcher(self.content_keywords + signal_keywords)
+        self._content_keyword_set = set(self.content_keywords)
+
+        self.ranker = TagRanker(config, self.extract_terms)
+        self.logger.info(f"태그 사전 로드: 키워드 {len(self.matcher.keywords)}개 ({self.dictionary_file.name})")
+
+    def _limit(self, limit: Optional[int]) -> int:
+        return self.limit if limit is None else limit
+
+    def extract_terms(self, title: str, content: str) -> Counter:
+        """제목과 본문에서 후보 태그 용어와 출현 횟수를 처음 나온 순서대로 뽑습니다.
+
+        사전 키워드는 자동자로 한 번에 찾고, 특수문자 제거 후 대문자로 된 5자 이하의 단어는 종목 심볼로 간주합니다.
+        """
+        terms = Counter()
+        for _, keyword in self.matcher.iter_matches(f"{title}\n{content}"):
+            if keyword in self._content_keyword_set:
+                terms[clean_tag(keyword)] += 1
+        for word in f"{title} {content}".split():
+            clean_word = ''.join(c for c in word if c.isalnum())
+            if 1 < len(clean_word) <= 5 and clean_word.isupper():
+                terms[clean_word] += 1
+        return Counter({term: count for term, count in terms.items() if len(term) > 1})
+
+    def content_tags(self, title: str, content: str, limit: int = None) -> List[str]:
+        """본문 용어를 TF-IDF 점수순으로 고르고, 부족하면 기본 태그로 채웁니다."""
+        limit = self._limit(limit)
+        tags = self.ranker.rank(title, content, limit)
+        for tag in self.fallback_tags:
+            if len(tags) >= limit:
+                break
+            if tag not in tags:
+                tags.append(tag)
+        return tags
+
+    def market_tags(self, title: str, content: str, limit: int = None, today: datetime = None) -> List[str]:
+        """시장 상황/자산군 신호가 강한 순으로 태그를 고르고, 날짜/브리핑 태그와 기본 태그로 채웁니다."""
+        counts = self.matcher.count(f"{title}\n{content}")
+
+        # 신호 세기(트리거 출현 횟수 합)가 큰 그룹부터, 같으면 사전 순서대로
+        groups = []
+        for condition in self.market_conditions.values():
+            strength = sum(counts[trigger] for trigger in condition.get('triggers', []))
+            if strength:
+                groups.append((strength, condition.get('tags', [])))
+        for asset_type, tags in self.asset_classes.items():
+            if counts[asset_type]:
+                groups.append((counts[asset_type], tags))
+        groups.sort(key=lambda group: -group[0])
+
+        today = today or datetime.now()
+        date_tags = [today.strftime(fmt) for fmt in self.date_formats] + self.briefing_tags
+
+        candidates = [tag for _, tags in groups for tag in tags] + date_tags + self.market_base_tags
+        return list(dict.fromkeys(candidates))[:self._limit(limit)]
+
+
+_shared_engine: Optional[TagEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_tag_engine(config: dict) -> TagEngine:
+    """프로세스 전체에서 공유하는 태그 엔진을 반환합니다 (사전과 자동자는 한 번만 생성)."""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = TagEngine(config)
+        return _shared_engine
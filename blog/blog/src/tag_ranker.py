@@ -0,0 +1,159 @@
+import argparse
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_IDF_FILE = PROJECT_ROOT / 'data' / 'tag_idf.json'
+DEFAULT_CORPUS_FILE = PROJECT_ROOT / 'data' / 'post_corpus.jsonl'
+
+# 같은 제목/본문에 대한 태그 순위를 보관할 최대 항목 수
+DEFAULT_CACHE_SIZE = 256
+
+
+def _resolve(path_value, default: Path) -> Path:
+    path = Path(path_value) if path_value else default
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def smoothed_idf(documents: int, document_frequency: int) -> float:
+    """평활화한 IDF 값입니다. 말뭉치가 비어 있으면 모든 용어가 1.0이 됩니다."""
+    return math.log((documents + 1) / (document_frequency + 1)) + 1
+
+
+class TagRanker:
+    """과거 포스팅 말뭉치로 미리 계산한 IDF 표를 사용해 후보 태그를 TF-IDF 점수순으로 정렬합니다.
+
+    후보 용어와 출현 횟수는 extract_terms(title, content)가 돌려주며, 점수가 같으면 본문에 먼저
+    나온 용어가 앞섭니다. 결과는 제목/본문의 해시를 키로 메모리에 보관하므로 같은 내용에는
+    항상 같은 태그를 바로 반환합니다.
+    """
+
+    def __init__(self, config: dict, extract_terms: Callable[[str, str], Counter]):
+        self.logger = logging.getLogger(__name__)
+        settings = (config or {}).get('tags', {})
+        self.extract_terms = extract_terms
+        self.idf_file = _resolve(settings.get('idf_file'), DEFAULT_IDF_FILE)
+        self.corpus_file = _resolve(settings.get('corpus_file'), DEFAULT_CORPUS_FILE)
+        self.record_corpus = settings.get('record_corpus', True)
+        self.cache_size = settings.get('cache_size', DEFAULT_CACHE_SIZE)
+
+        self.documents, self.idf = self._load_idf()
+        # 말뭉치에 없던 용어는 가장 드문 용어로 취급
+        self.default_idf = smoothed_idf(self.documents, 0)
+
+        self._cache: 'OrderedDict[str, List[str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load_idf(self):
+        """IDF 표 파일을 읽어 (문서 수, 용어별 IDF)를 반환합니다."""
+        try:
+            with open(self.idf_file, 'r', encoding='utf-8') as f:
+                table = json.load(f)
+            return table.get('documents', 0), table.get('idf', {})
+        except FileNotFoundError:
+            self.logger.info(f"IDF 표가 없어 출현 횟수로만 태그 순위를 정합니다: {self.idf_file}")
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"IDF 표 읽기 실패 ({self.idf_file}): {e}")
+        return 0, {}
+
+    @staticmethod
+    def content_key(title: str, content: str) -> str:
+        return hashlib.sha256(f"{title}\n{content}".encode('utf-8')).hexdigest()
+
+    def score(self, counts: Counter) -> Dict[str, float]:
+        """용어별 TF-IDF 점수를 계산합니다 (TF는 로그 스케일로 완화)."""
+        return {
+            term: (1 + math.log(count)) * self.idf.get(term, self.default_idf)
+            for term, count in counts.items() if count > 0
+        }
+
+    def rank(self, title: str, content: str, limit: int) -> List[str]:
+        """제목과 본문에서 뽑은 후보 용어를 점수가 높은 순으로 최대 limit개 반환합니다."""
+        key = self.content_key(title, content)
+        with self._lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+                return ranked[:limit]
+
+        scores = self.score(self.extract_terms(title, content))
+        # sorted는 안정 정렬이므로 점수가 같으면 먼저 나온 용어 순서가 유지됨
+        ranked = sorted(scores, key=lambda term: -scores[term])
+
+        with self._lock:
+            self._cache[key] = ranked
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return ranked[:limit]
+
+    def clear_cache(self):
+        """내용 해시별 태그 결과 캐시를 비웁니다."""
+        with self._lock:
+            self._cache.clear()
+
+    def record_post(self, title: str, content: str):
+        """발행한 글을 말뭉치에 추가합니다 (IDF 표는 build 명령으로 다시 만듭니다)."""
+        if not self.record_corpus:
+            return
+        try:
+            self.corpus_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.corpus_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'time': datetime.now().isoformat(timespec='seconds'),
+                    'title': title,
+                    'content': content
+                }, ensure_ascii=False) + '\n')
+        except OSError as e:
+            self.logger.warning(f"포스팅 말뭉치 기록 실패 ({self.corpus_file}): {e}")
+
+
+def build_idf_table(corpus_file: Path, extract_terms: Callable[[str, str], Counter]) -> Dict:
+    """말뭉치(JSONL, title/content)의 문서 빈도로 IDF 표를 만듭니다."""
+    documents = 0
+    document_frequency = Counter()
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                post = json.loads(line)
+            except ValueError:
+                continue
+            documents += 1
+            document_frequency.update(extract_terms(post.get('title', ''), post.get('content', '')).keys())
+    return {
+        'documents': documents,
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+        # 소수점 4자리로 줄여 표를 작게 유지
+        'idf': {term: round(smoothed_idf(documents, df), 4) for term, df in sorted(document_frequency.items())}
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="과거 포스팅 말뭉치로 태그 IDF 표 생성")
+    parser.add_argument('--corpus', default=str(DEFAULT_CORPUS_FILE), help="포스팅 말뭉치 (JSONL, title/content)")
+    parser.add_argument('--output', default=str(DEFAULT_IDF_FILE), help="저장할 IDF 표 파일")
+    args = parser.parse_args(argv)
+
+    # 태그 엔진과 같은 용어 추출 규칙을 사용해야 IDF 표의 용어가 일치함
+    import yaml
+    from tag_engine import TagEngine
+
+    with open(PROJECT_ROOT / 'config' / 'config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    table = build_idf_table(Path(args.corpus), TagEngine(config).extract_terms)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"IDF 표 저장: {output} (문서 {table['documents']}개, 용어 {len(table['idf'])}개)")
+
+
+if __name__ == "__main__":
+    # 사용 예: python tag_ranker.py --corpus ../data/post_corpus.jsonl
+    main()
@@ -0,0 +1,287 @@
+import argparse
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_LEDGER_DIR = PROJECT_ROOT / 'logs' / 'trace'
+
+# 스레드별로 진행 중인 측정 구간 (중첩 구간은 스택으로 관리)
+_local = threading.local()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """값 목록의 백분위 값(nearest-rank)을 반환합니다. 값이 없으면 None."""
+    samples = sorted(values)
+    if not samples:
+        return None
+    rank = max(math.ceil(pct / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+class Span:
+    """측정 중인 한 구간의 소요 시간, 재시도 횟수, 전송 바이트 수입니다."""
+
+    def __init__(self, stage: str, attrs: Dict = None, run_id: str = None, parent: 'Span' = None):
+        self.stage = stage
+        self.attrs = dict(attrs or {})
+        self.run_id = run_id
+        self.parent = parent
+        self.retries = 0
+        self.bytes = 0
+        self.status = 'ok'
+        self.started_at = datetime.now()
+        self.started = time.monotonic()
+        self.duration = None
+
+    def to_record(self, run_id: str) -> Dict:
+        record = {
+            'run_id': run_id,
+            'stage': self.stage,
+            'start': self.started_at.isoformat(timespec='milliseconds'),
+            'duration': round(self.duration, 3),
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'status': self.status
+        }
+        if self.parent is not None:
+            record['parent'] = self.parent.stage
+        if self.attrs:
+            record['attrs'] = self.attrs
+        return record
+
+
+class RunLedger:
+    """실행(run) 하나마다 JSONL 파일 하나에 구간 기록을 남기는 원장입니다."""
+
+    def __init__(self, config: dict = None):
+        self.logger = logging.getLogger(__name__)
+        settings = (config or {}).get('tracing', {})
+        self.enabled = settings.get('enabled', True)
+        ledger_dir = Path(settings.get('ledger_dir', DEFAULT_LEDGER_DIR))
+        self.dir = ledger_dir if ledger_dir.is_absolute() else PROJECT_ROOT / ledger_dir
+        self.keep_runs = settings.get('keep_runs', 500)  # 보관할 최근 실행 파일 수
+        self._lock = threading.Lock()
+        # 실행 ID는 스레드별로 관리 (작업 스레드는 bind()로 제출한 스레드의 실행 ID를 물려받음)
+        self._runs = threading.local()
+        self._adhoc_run_id: Optional[str] = None
+
+    @property
+    def run_id(self) -> Optional[str]:
+        """현재 스레드에서 진행 중인 실행 ID입니다. 실행 중이 아니면 None."""
+        return getattr(self._runs, 'run_id', None)
+
+    @run_id.setter
+    def run_id(self, value: Optional[str]):
+        self._runs.run_id = value
+
+    @staticmethod
+    def _new_run_id(label: str) -> str:
+        return f"{label}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+
+    def begin_run(self, label: str = 'run') -> str:
+        """새 실행을 시작하고 실행 ID를 반환합니다. 이후 이 스레드의 기록은 이 실행의 파일에 남습니다."""
+        self.run_id = self._new_run_id(label)
+        self._prune()
+        return self.run_id
+
+    def end_run(self):
+        """현재 스레드의 실행을 끝냅니다. 이후 구간은 다음 실행의 파일에 섞이지 않습니다."""
+        self.run_id = None
+
+    def write(self, span: Span):
+        """완료된 구간을 그 구간이 속한 실행의 원장 파일에 추가합니다."""
+        if not self.enabled:
+            return
+        with self._lock:
+            run_id = span.run_id
+            if run_id is None:
+                # 실행 밖(단독 실행한 모듈 등)에서 측정된 구간은 프로세스별 별도 실행으로 기록
+                if self._adhoc_run_id is None:
+                    self._adhoc_run_id = self._new_run_id('adhoc')
+                run_id = self._adhoc_run_id
+            try:
+                self.dir.mkdir(parents=True, exist_ok=True)
+                with open(self.dir / f"{run_id}.jsonl", 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(span.to_record(run_id), ensure_ascii=False) + '\n')
+            except OSError as e:
+                self.logger.warning(f"실행 원장 기록 실패: {e}")
+
+    def _prune(self):
+        """오래된 실행 파일을 보관 개수만큼만 남기고 삭제합니다."""
+        if not self.enabled or not self.dir.exists():
+            return
+        files = sorted(self.dir.glob('*.jsonl'), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(len(files) - self.keep_runs, 0)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def iter_records(self, last_runs: int = None) -> Iterator[Dict]:
+        """최근 실행 파일들의 구간 기록을 순서대로 읽어옵니다."""
+        if not self.dir.exists():
+            return
+        files = sorted(self.dir.glob('*.jsonl'), key=lambda p: p.stat().st_mtime)
+        if last_runs:
+            files = files[-last_runs:]
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def summarize(self, last_runs: int = None) -> Dict[str, Dict]:
+        """단계별 호출 수, p50/p95 소요 시간, 재시도 수, 바이트 수를 집계합니다."""
+        durations = defaultdict(list)
+        totals = defaultdict(lambda: {'retries': 0, 'bytes': 0, 'errors': 0})
+        for record in self.iter_records(last_runs):
+            stage = record['stage']
+            durations[stage].append(record['duration'])
+            totals[stage]['retries'] += record.get('retries', 0)
+            totals[stage]['bytes'] += record.get('bytes', 0)
+            totals[stage]['errors'] += record.get('status') != 'ok'
+
+        return {
+            stage: {
+                'count': len(values),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                **totals[stage]
+            }
+            for stage, values in durations.items()
+        }
+
+
+_ledger: Optional[RunLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger(config: dict = None) -> RunLedger:
+    """프로세스 전체에서 공유하는 실행 원장을 반환합니다."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = RunLedger(config)
+        return _ledger
+
+
+def _stack() -> List[Span]:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def current_span() -> Optional[Span]:
+    """현재 스레드에서 측정 중인 가장 안쪽 구간을 반환합니다."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def add_bytes(count: int):
+    """현재 구간에 전송 바이트 수를 더합니다. 측정 중인 구간이 없으면 무시합니다."""
+    span = current_span()
+    if span is not None and count:
+        span.bytes += count
+
+
+def add_retries(count: int = 1):
+    """현재 구간에 재시도 횟수를 더합니다. 측정 중인 구간이 없으면 무시합니다."""
+    span = current_span()
+    if span is not None and count:
+        span.retries += count
+
+
+@contextmanager
+def trace_stage(stage: str, **attrs) -> Iterator[Span]:
+    """with 블록의 소요 시간을 측정하여 실행 원장에 기록합니다.
+
+    블록 안에서 발생한 예외는 status='error'로 기록한 뒤 그대로 전달합니다.
+    중첩된 구간의 바이트 수는 바깥 구간에도 합산됩니다 (bind()로 넘긴 다른 스레드의 부모 구간 포함).
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    span = Span(stage, attrs, run_id=get_ledger().run_id, parent=parent)
+    stack.append(span)
+    try:
+        yield span
+    except BaseException:
+        if span.status == 'ok':
+            span.status = 'error'
+        raise
+    finally:
+        span.duration = time.monotonic() - span.started
+        stack.pop()
+        if stack:
+            stack[-1].bytes += span.bytes
+        get_ledger().write(span)
+
+
+def traced(stage: str):
+    """함수 호출 전체를 하나의 구간으로 측정하는 데코레이터입니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(func):
+    """현재 스레드의 실행 ID와 측정 중인 구간을 작업 스레드로 넘기도록 함수를 감쌉니다.
+
+    스레드 풀에 작업을 제출할 때 사용하며, 작업 스레드에서 측정한 구간은 같은 실행 파일에
+    제출한 쪽 구간의 하위 구간으로 기록됩니다.
+    """
+    ledger = get_ledger()
+    run_id = ledger.run_id
+    parent = current_span()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = _stack()
+        previous_run_id = ledger.run_id
+        ledger.run_id = run_id
+        if parent is not None:
+            stack.append(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if parent is not None:
+                stack.pop()
+            ledger.run_id = previous_run_id
+    return wrapper
+
+
+def print_summary(summary: Dict[str, Dict]):
+    """집계 결과를 표 형태로 출력합니다."""
+    if not summary:
+        print("기록된 구간이 없습니다.")
+        return
+    width = max(len(stage) for stage in summary)
+    print(f"{'stage':<{width}}  {'count':>5}  {'p50(s)':>8}  {'p95(s)':>8}  {'retries':>7}  {'errors':>6}  {'KB':>9}")
+    for stage, entry in sorted(summary.items(), key=lambda item: -item[1]['p95']):
+        print(f"{stage:<{width}}  {entry['count']:>5}  {entry['p50']:>8.2f}  {entry['p95']:>8.2f}  "
+              f"{entry['retries']:>7}  {entry['errors']:>6}  {entry['bytes'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    # 사용 예: python tracing.py --runs 20
+    parser = argparse.ArgumentParser(description="실행 원장의 단계별 p50/p95 소요 시간 요약")
+    parser.add_argument('--runs', type=int, default=None, help="최근 N개 실행만 집계 (기본: 전체)")
+    parser.add_argument('--dir', default=None, help="원장 디렉터리 (기본: logs/trace)")
+    args = parser.parse_args()
+
+    ledger_config = {'tracing': {'ledger_dir': args.dir}} if args.dir else None
+    print_summary(RunLedger(ledger_config).summarize(args.runs))